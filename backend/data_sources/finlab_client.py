@@ -6,10 +6,12 @@ FinLab API Client Wrapper
 Patterns copied from reference examples
 """
 
+import os
+import functools
 from typing import Optional, Dict, Any, Collection, Set
 import pandas as pd
-from datetime import datetime
-from config.settings import ensure_finlab_login
+from datetime import date, datetime
+from config.settings import ensure_finlab_login, get_settings
 from backend.etl.finlab_compat import convert_to_pandas, is_finlab_dataframe
 
 
@@ -135,6 +137,23 @@ class FinLabClient:
             print(f"❌ 獲取 {field} 失敗: {e}")
             return pd.DataFrame()
 
+    def _get_tail(self, field: str, n: int = 2):
+        """
+        獲取 FinLab 數據的最近 n 期
+
+        FinLab data.get 沒有日期區間參數，只能下載完整歷史；
+        取尾端後即釋放完整表，呼叫端（例如市場總覽頁的快取）不必長期持有多年歷史。
+
+        Args:
+            field: 數據欄位 (格式: 'table:field')
+            n: 保留的期數
+
+        Returns:
+            最近 n 期的 FinlabDataFrame（失敗時為空 DataFrame）
+        """
+        result = self._get_and_convert(field)
+        return result.tail(n) if not result.empty else result
+
     # ========== 價格數據 ==========
 
     def get_price_data(self) -> Dict[str, pd.DataFrame]:
@@ -162,6 +181,14 @@ class FinLabClient:
         """獲取成交量"""
         return self._get_and_convert('price:成交股數')
 
+    def get_close_tail(self, n: int = 2) -> pd.DataFrame:
+        """獲取最近 n 期收盤價"""
+        return self._get_tail('price:收盤價', n)
+
+    def get_volume_tail(self, n: int = 2) -> pd.DataFrame:
+        """獲取最近 n 期成交量"""
+        return self._get_tail('price:成交股數', n)
+
     # ========== 市值數據 ==========
 
     def get_market_cap(self) -> pd.DataFrame:
@@ -293,6 +320,21 @@ class FinLabClient:
             'margin_sell': self._get_and_convert('margin_transactions:融資賣出'),
         }
 
+    def get_margin_data_tail(self, n: int = 2) -> Dict[str, pd.DataFrame]:
+        """
+        獲取最近 n 期融資 / 融券餘額（只下載市場總覽需要的兩個欄位）
+
+        Args:
+            n: 保留的期數
+
+        Returns:
+            包含 margin_balance、short_balance 的字典
+        """
+        return {
+            'margin_balance': self._get_tail('margin_transactions:融資今日餘額', n),
+            'short_balance': self._get_tail('margin_transactions:融券今日餘額', n),
+        }
+
     # ========== 三大法人買賣超 ==========
 
     def get_institutional_investors_trading(self) -> Dict[str, pd.DataFrame]:
@@ -303,7 +345,6 @@ class FinLabClient:
             包含外資、投信、自營商買賣超的字典
         """
         self._update_progress("💼 正在獲取三大法人買賣超數據...")
-        data = self._get_and_convert('institutional_investors_trading_summary:外陸資買賣超股數(不含外資自營商)')
 
         return {
             'foreign_buy': self._get_and_convert('institutional_investors_trading_summary:外陸資買進股數(不含外資自營商)'),
@@ -317,6 +358,22 @@ class FinLabClient:
             'dealer_net': self._get_and_convert('institutional_investors_trading_summary:自營商買賣超股數(自行買賣)'),
         }
 
+    def get_institutional_investors_trading_tail(self, n: int = 2) -> Dict[str, pd.DataFrame]:
+        """
+        獲取最近 n 期三大法人買賣超股數（只下載外資 / 投信 / 自營商的淨買賣超欄位）
+
+        Args:
+            n: 保留的期數
+
+        Returns:
+            包含 foreign_net、investment_trust_net、dealer_net 的字典
+        """
+        return {
+            'foreign_net': self._get_tail('institutional_investors_trading_summary:外陸資買賣超股數(不含外資自營商)', n),
+            'investment_trust_net': self._get_tail('institutional_investors_trading_summary:投信買賣超股數', n),
+            'dealer_net': self._get_tail('institutional_investors_trading_summary:自營商買賣超股數(自行買賣)', n),
+        }
+
     # ========== 公司基本資訊 ==========
 
     def get_company_info(self) -> Dict[str, pd.Series]:
@@ -328,12 +385,13 @@ class FinLabClient:
             注意: 已將 stock_id 設為 index
         """
         self._update_progress("🏢 正在獲取公司基本資訊...")
-        company_info = self._get_and_convert('company_basic_info')
+        try:
+            company_info = load_company_basic_info(date.today().isoformat())
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            company_info = pd.DataFrame()
 
         if not company_info.empty:
-            # 設置 stock_id 為 index（關鍵步驟！）
-            company_info = company_info.set_index('stock_id')
-
             return {
                 'industry': company_info['產業類別'],
                 'company_name': company_info['公司名稱'],
@@ -540,6 +598,57 @@ class FinLabClient:
             return data_dict
 
 
+# ========== 公司基本資訊快取 ==========
+
+@functools.lru_cache(maxsize=8)
+def load_company_basic_info(as_of: str) -> pd.DataFrame:
+    """
+    載入公司基本資訊（行程內 lru_cache + 當日磁碟快取）
+
+    同一天內只向 FinLab 請求一次，之後直接讀取 data/cache 下的快取檔。
+    回傳的 DataFrame 為共用物件，呼叫端請勿原地修改。
+
+    Args:
+        as_of: 快取日期鍵（ISO 格式，例如 '2024-01-31'）
+
+    Returns:
+        已將 stock_id 設為 index 的公司基本資訊
+
+    Raises:
+        RuntimeError: 無法獲取 company_basic_info
+    """
+    cache_dir = get_settings().project_root / 'data' / 'cache'
+    cache_path = cache_dir / f'company_basic_info_{as_of}.pkl'
+
+    if cache_path.exists():
+        try:
+            return pd.read_pickle(cache_path)
+        except Exception as e:
+            # 快取檔損毀或無法讀取時改為重新向 FinLab 請求
+            print(f"⚠️  讀取公司基本資訊快取失敗，重新下載: {e}")
+
+    company_info = FinLabClient()._get_and_convert('company_basic_info')
+    if company_info.empty:
+        # 拋出例外而非回傳空表，避免 lru_cache 記住失敗結果
+        raise RuntimeError("無法獲取 company_basic_info")
+
+    # 設置 stock_id 為 index（關鍵步驟！）
+    company_info = convert_to_pandas(company_info).set_index('stock_id')
+
+    # 先寫入暫存檔再 os.replace，避免其他程序讀到寫一半的檔案
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+    company_info.to_pickle(tmp_path)
+    os.replace(tmp_path, cache_path)
+
+    # 每天一個快取檔，寫入新檔後清除其他日期的舊檔
+    for old_path in cache_dir.glob('company_basic_info_*.pkl'):
+        if old_path != cache_path:
+            old_path.unlink(missing_ok=True)
+
+    return company_info
+
+
 # ========== 測試代碼 ==========
 
 def test_finlab_client():
@@ -9,7 +9,7 @@ Trading Economics API Client Wrapper
 import pandas as pd
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from config.settings import settings
+from config.settings import get_settings
 from backend.data_sources.investing_com_scraper import InvestingComScraper
 
 
@@ -24,7 +24,7 @@ class TradingEconomicsClient:
             api_key: API Key（如果不提供則從 settings 讀取）
             use_scraper: 是否優先使用 Investing.com 爬蟲（默認 True）
         """
-        self.api_key = api_key or settings.trading_economics_api_key
+        self.api_key = api_key or get_settings().trading_economics_api_key
         self.use_scraper = use_scraper
         self.scraper = InvestingComScraper() if use_scraper else None
 
@@ -46,10 +46,38 @@ class YFinanceClient:
         'USDTWD': 'TWD=X',       # 美元兌台幣
     }
 
+    # 各類市場包含的標的
+    US_INDICES = ['DJI', 'SP500', 'NASDAQ', 'SOX', 'VIX', 'DXY']
+    CRYPTOS = ['BTC', 'ETH']
+    ASIA_MARKETS = ['N225', 'KS11', 'HSI', 'SSEC', 'SZSE']
+    TAIWAN_INDICES = ['TWII', 'TWO', '0050.TW']
+
     def __init__(self):
         """初始化客戶端"""
         pass
 
+    @staticmethod
+    def _build_quote(current_price: float, prev_close: Optional[float]) -> Dict[str, Any]:
+        """
+        由現價與昨收組成報價字典
+
+        Args:
+            current_price: 現價
+            prev_close: 昨收價
+
+        Returns:
+            報價資訊字典
+        """
+        change = current_price - prev_close if prev_close else 0
+        change_percent = (change / prev_close * 100) if prev_close else 0
+
+        return {
+            'price': round(float(current_price), 2),
+            'change': round(float(change), 2),
+            'change_percent': round(float(change_percent), 2),
+            'prev_close': round(float(prev_close), 2) if prev_close else None
+        }
+
     def _get_quote(self, ticker: str, retry: int = 3) -> Optional[Dict[str, Any]]:
         """
         獲取單一標的報價
@@ -85,16 +113,7 @@ class YFinanceClient:
                 if current_price is None:
                     return None
 
-                # 計算漲跌
-                change = current_price - prev_close if prev_close else 0
-                change_percent = (change / prev_close * 100) if prev_close else 0
-
-                return {
-                    'price': round(float(current_price), 2),
-                    'change': round(float(change), 2),
-                    'change_percent': round(float(change_percent), 2),
-                    'prev_close': round(float(prev_close), 2) if prev_close else None
-                }
+                return self._build_quote(current_price, prev_close)
 
             except Exception as e:
                 if attempt == retry - 1:
@@ -104,26 +123,65 @@ class YFinanceClient:
 
         return None
 
-    def get_us_indices(self) -> Dict[str, Dict[str, Any]]:
+    def get_quotes_batch(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        獲取美股指數
+        批次獲取多個標的報價（一次 yf.download 請求全部標的，取代逐一呼叫 _get_quote）
+
+        Args:
+            keys: TICKER_MAP 中的代碼列表
 
         Returns:
-            美股指數字典
+            {代碼: 報價資訊字典}，批次結果缺漏的標的會改以 _get_quote 單獨獲取
         """
-        print("📊 正在獲取美股指數數據...")
-
-        indices = ['DJI', 'SP500', 'NASDAQ', 'SOX', 'VIX', 'DXY']
+        tickers = {key: self.TICKER_MAP[key] for key in keys}
+
+        try:
+            # 取 5 天日線以涵蓋週末與休市日，最後兩個有效收盤即為現價與昨收
+            hist = yf.download(
+                list(dict.fromkeys(tickers.values())),
+                period='5d',
+                interval='1d',
+                group_by='ticker',
+                auto_adjust=False,
+                progress=False,
+                threads=True
+            )
+        except Exception as e:
+            print(f"⚠️  批次獲取報價失敗，改為逐一獲取: {e}")
+            hist = pd.DataFrame()
+
+        has_tickers = isinstance(hist.columns, pd.MultiIndex)
         result = {}
 
-        for key in indices:
-            ticker = self.TICKER_MAP[key]
-            quote = self._get_quote(ticker)
+        for key, ticker in tickers.items():
+            quote = None
+
+            if has_tickers and ticker in hist.columns.get_level_values(0):
+                closes = hist[ticker]['Close'].dropna()
+                if not closes.empty:
+                    current_price = closes.iloc[-1]
+                    prev_close = closes.iloc[-2] if len(closes) > 1 else current_price
+                    quote = self._build_quote(current_price, prev_close)
+
+            if quote is None:
+                quote = self._get_quote(ticker)
+
             if quote:
                 result[key] = quote
 
         return result
 
+    def get_us_indices(self) -> Dict[str, Dict[str, Any]]:
+        """
+        獲取美股指數
+
+        Returns:
+            美股指數字典
+        """
+        print("📊 正在獲取美股指數數據...")
+
+        return self.get_quotes_batch(self.US_INDICES)
+
     def get_crypto(self) -> Dict[str, Dict[str, Any]]:
         """
         獲取加密貨幣價格
@@ -133,16 +191,7 @@ class YFinanceClient:
         """
         print("₿ 正在獲取加密貨幣數據...")
 
-        cryptos = ['BTC', 'ETH']
-        result = {}
-
-        for key in cryptos:
-            ticker = self.TICKER_MAP[key]
-            quote = self._get_quote(ticker)
-            if quote:
-                result[key] = quote
-
-        return result
+        return self.get_quotes_batch(self.CRYPTOS)
 
     def get_asia_markets(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -153,16 +202,7 @@ class YFinanceClient:
         """
         print("🌏 正在獲取亞洲市場數據...")
 
-        markets = ['N225', 'KS11', 'HSI', 'SSEC', 'SZSE']
-        result = {}
-
-        for key in markets:
-            ticker = self.TICKER_MAP[key]
-            quote = self._get_quote(ticker)
-            if quote:
-                result[key] = quote
-
-        return result
+        return self.get_quotes_batch(self.ASIA_MARKETS)
 
     def get_forex(self, pair: str = 'USDTWD') -> Optional[Dict[str, Any]]:
         """
@@ -192,16 +232,7 @@ class YFinanceClient:
         """
         print("🇹🇼 正在獲取台股指數數據...")
 
-        indices = ['TWII', 'TWO', '0050.TW']
-        result = {}
-
-        for key in indices:
-            ticker = self.TICKER_MAP[key]
-            quote = self._get_quote(ticker)
-            if quote:
-                result[key] = quote
-
-        return result
+        return self.get_quotes_batch(self.TAIWAN_INDICES)
 
     def get_all_market_data(self) -> Dict[str, Any]:
         """
@@ -214,12 +245,15 @@ class YFinanceClient:
         print("📦 開始獲取國際市場數據...")
         print("=" * 70)
 
+        # 所有標的合併為一次批次請求，再依市場分組
+        quotes = self.get_quotes_batch(self.US_INDICES + self.CRYPTOS + self.ASIA_MARKETS + ['USDTWD'])
+
         result = {
-            'us_indices': self.get_us_indices(),
-            'crypto': self.get_crypto(),
-            'asia_markets': self.get_asia_markets(),
+            'us_indices': {key: quotes[key] for key in self.US_INDICES if key in quotes},
+            'crypto': {key: quotes[key] for key in self.CRYPTOS if key in quotes},
+            'asia_markets': {key: quotes[key] for key in self.ASIA_MARKETS if key in quotes},
             'forex': {
-                'USDTWD': self.get_forex('USDTWD')
+                'USDTWD': quotes.get('USDTWD')
             },
             'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
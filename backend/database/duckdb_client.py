@@ -11,12 +11,15 @@ import pandas as pd
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
-from config.settings import settings
+from config.settings import get_settings
 
 
 class DuckDBClient:
     """DuckDB 資料庫客戶端"""
 
+    # 本程序內已完成資料表初始化的資料庫檔案 {(絕對路徑, inode)}（同一檔案只需執行一次 CREATE TABLE IF NOT EXISTS）
+    _initialized_paths = set()
+
     def __init__(self, db_path: Optional[str] = None):
         """
         初始化DuckDB客戶端
@@ -24,7 +27,7 @@ class DuckDBClient:
         Args:
             db_path: 資料庫檔案路徑，默認使用settings中的配置
         """
-        self.db_path = db_path or settings.duckdb_path
+        self.db_path = db_path or get_settings().duckdb_path
 
         # 確保資料目錄存在
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -32,8 +35,29 @@ class DuckDBClient:
         # 連接資料庫
         self.conn = duckdb.connect(self.db_path)
 
-        # 初始化資料表
-        self._init_schema()
+        # 初始化資料表（同一程序內每個資料庫檔案只做一次）
+        schema_key = self._schema_key()
+        if schema_key is None or schema_key not in DuckDBClient._initialized_paths:
+            self._init_schema()
+            if schema_key is not None:
+                DuckDBClient._initialized_paths.add(schema_key)
+
+    def _schema_key(self) -> Optional[tuple]:
+        """
+        資料表初始化記錄的鍵
+
+        以絕對路徑 + inode 識別資料庫檔案：不同寫法的相對路徑指向同一檔案時共用記錄，
+        檔案在程序執行中被刪除或替換（inode 改變）時會重新初始化。
+
+        Returns:
+            (絕對路徑, inode)；記憶體資料庫（每次連線都是新的空資料庫）或找不到檔案時回傳 None（不記錄）
+        """
+        if self.db_path.startswith(':memory:'):
+            return None
+        db_file = Path(self.db_path).resolve()
+        if not db_file.exists():
+            return None
+        return str(db_file), db_file.stat().st_ino
 
     def _init_schema(self):
         """初始化資料庫結構"""
@@ -247,6 +271,58 @@ class DuckDBClient:
 
         print(f"✅ 已插入 {len(df)} 筆選股結果 ({strategy_name}, {selection_date})")
 
+    def upsert_strategy_selections(
+        self,
+        selection_date: date,
+        results: Dict[str, pd.DataFrame]
+    ):
+        """
+        批次插入或更新多個策略的選股結果（單一交易：一次 DELETE + 一次 INSERT）
+
+        Args:
+            selection_date: 選股日期
+            results: {策略名稱: 選股結果 DataFrame (columns: stock_id, score, rank, metadata)}
+        """
+        frames = {
+            strategy_name: selections
+            for strategy_name, selections in results.items()
+            if not selections.empty
+        }
+
+        if not frames:
+            print("⚠️  所有策略選股結果皆為空")
+            return
+
+        # 合併所有策略結果，只保留資料表需要的6個欄位
+        required_columns = ['selection_date', 'strategy_name', 'stock_id', 'score', 'rank', 'metadata']
+        df = pd.concat(
+            [selections.assign(strategy_name=strategy_name, selection_date=selection_date)
+             for strategy_name, selections in frames.items()],
+            ignore_index=True
+        )[required_columns]
+
+        placeholders = ', '.join(['?'] * len(frames))
+
+        self.conn.begin()
+        try:
+            # 先刪除這些策略該日期的舊數據
+            self.conn.execute(f"""
+                DELETE FROM strategy_selections
+                WHERE selection_date = ? AND strategy_name IN ({placeholders})
+            """, [selection_date, *frames])
+
+            # 插入新數據
+            self.conn.execute("""
+                INSERT INTO strategy_selections
+                SELECT * FROM df
+            """)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        print(f"✅ 已插入 {len(df)} 筆選股結果 ({len(frames)} 個策略, {selection_date})")
+
     def get_strategy_selections(
         self,
         strategy_name: Optional[str] = None,
@@ -11,7 +11,7 @@ from typing import Dict, Any, Optional, List, Tuple, Set
 import pandas as pd
 import numpy as np
 from datetime import date, datetime
-from config.settings import settings
+from config.settings import get_settings
 
 
 class StrategyBase(ABC):
@@ -29,16 +29,22 @@ class StrategyBase(ABC):
     # 子類可以覆寫或擴充的資料需求集合
     required_data_keys: Set[str] = frozenset()
 
-    def __init__(self, name: str, description: str):
+    # 策略名稱與描述（子類以類別屬性宣告，列出策略時只需導入類別、不需實例化）
+    name: str = ""
+    description: str = ""
+
+    def __init__(self, name: Optional[str] = None, description: Optional[str] = None):
         """
         初始化策略
 
         Args:
-            name: 策略名稱
-            description: 策略描述
+            name: 策略名稱（None 時使用類別屬性）
+            description: 策略描述（None 時使用類別屬性）
         """
-        self.name = name
-        self.description = description
+        if name is not None:
+            self.name = name
+        if description is not None:
+            self.description = description
 
     @abstractmethod
     def screen(
@@ -188,6 +194,26 @@ class StrategyBase(ABC):
 
         return standardized
 
+    @staticmethod
+    def group_mean(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+        """
+        分組平均（單次掃描的分段加總，NaN 不計入）
+
+        Args:
+            values: 數值陣列（float）
+            codes: 分組代碼（例如 pd.factorize 的結果，-1 表示無分組）
+            n_groups: 分組數
+
+        Returns:
+            長度為 n_groups 的平均值陣列，無有效數據的分組為 NaN
+        """
+        valid = (codes >= 0) & ~np.isnan(values)
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=n_groups)
+        counts = np.bincount(codes[valid], minlength=n_groups)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+
     def rank_percentile(self, factor: pd.DataFrame, ascending: bool = True) -> pd.DataFrame:
         """
         百分位排名（0-1之間）
@@ -407,11 +433,8 @@ class StrategyBase(ABC):
 class DemoStrategy(StrategyBase):
     """示範策略（用於測試）"""
 
-    def __init__(self):
-        super().__init__(
-            name="示範策略",
-            description="這是一個示範策略，選擇市值最大的前10檔股票"
-        )
+    name = "示範策略"
+    description = "這是一個示範策略，選擇市值最大的前10檔股票"
 
     def screen(
         self,
@@ -431,8 +454,8 @@ class DemoStrategy(StrategyBase):
         mask = self.apply_basic_filters(
             data,
             min_price=10,
-            min_market_cap=settings.min_market_cap,
-            liquidity_percentile=settings.min_liquidity_percentile
+            min_market_cap=get_settings().min_market_cap,
+            liquidity_percentile=get_settings().min_liquidity_percentile
         )
 
         # 篩選後的市值
@@ -23,7 +23,7 @@ import pandas as pd
 import numpy as np
 from datetime import date
 from backend.strategies.base_strategy import StrategyBase
-from config.settings import settings
+from config.settings import get_settings
 
 
 class BreakoutAfterBaseStrategy(StrategyBase):
@@ -32,11 +32,8 @@ class BreakoutAfterBaseStrategy(StrategyBase):
     # 策略特定的數據需求
     required_data_keys = {"revenue", "roe", "dividend_announcement", "dividend_yield"}
 
-    def __init__(self):
-        super().__init__(
-            name="長時間未破底後創新高",
-            description="選擇底部穩固（60天未破底）且近期突破的股票"
-        )
+    name = "長時間未破底後創新高"
+    description = "選擇底部穩固（60天未破底）且近期突破的股票"
 
     def screen(
         self,
@@ -160,8 +157,8 @@ class BreakoutAfterBaseStrategy(StrategyBase):
             data,
             min_price=20,
             max_price=300,
-            min_market_cap=settings.min_market_cap,
-            liquidity_percentile=settings.min_liquidity_percentile,
+            min_market_cap=get_settings().min_market_cap,
+            liquidity_percentile=get_settings().min_liquidity_percentile,
             exclude_attention=True,
             exclude_cash_delivery=True
         )
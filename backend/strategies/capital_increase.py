@@ -28,7 +28,7 @@ import pandas as pd
 import numpy as np
 from datetime import date
 from backend.strategies.base_strategy import StrategyBase
-from config.settings import settings
+from config.settings import get_settings
 
 
 class CapitalIncreaseStrategy(StrategyBase):
@@ -37,11 +37,8 @@ class CapitalIncreaseStrategy(StrategyBase):
     # 策略特定的數據需求
     required_data_keys = {"eps"}
 
-    def __init__(self):
-        super().__init__(
-            name="大現增快繳款結束",
-            description="偵測現增繳款後現金大增、基本面良好的股票"
-        )
+    name = "大現增快繳款結束"
+    description = "偵測現增繳款後現金大增、基本面良好的股票"
 
     def screen(
         self,
@@ -147,8 +144,8 @@ class CapitalIncreaseStrategy(StrategyBase):
             data,
             min_price=20,
             max_price=150,
-            min_market_cap=settings.min_market_cap,
-            liquidity_percentile=settings.min_liquidity_percentile,
+            min_market_cap=get_settings().min_market_cap,
+            liquidity_percentile=get_settings().min_liquidity_percentile,
             exclude_attention=True,
             exclude_cash_delivery=True
         )
@@ -27,7 +27,7 @@ import pandas as pd
 import numpy as np
 from datetime import date
 from backend.strategies.base_strategy import StrategyBase
-from config.settings import settings
+from config.settings import get_settings
 
 
 class CashGrowthStrategy(StrategyBase):
@@ -36,11 +36,8 @@ class CashGrowthStrategy(StrategyBase):
     # 策略特定的數據需求
     required_data_keys = {"cash", "eps", "revenue_yoy"}
 
-    def __init__(self):
-        super().__init__(
-            name="現金快速累積中",
-            description="選擇營業現金流強、現金持續增加的高品質公司"
-        )
+    name = "現金快速累積中"
+    description = "選擇營業現金流強、現金持續增加的高品質公司"
 
     def screen(
         self,
@@ -171,8 +168,8 @@ class CashGrowthStrategy(StrategyBase):
         basic_filter = self.apply_basic_filters(
             data,
             min_price=15,
-            min_market_cap=settings.min_market_cap,
-            liquidity_percentile=settings.min_liquidity_percentile,
+            min_market_cap=get_settings().min_market_cap,
+            liquidity_percentile=get_settings().min_liquidity_percentile,
             exclude_attention=True,
             exclude_cash_delivery=True
         )
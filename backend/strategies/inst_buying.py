@@ -25,7 +25,7 @@ import pandas as pd
 import numpy as np
 from datetime import date
 from backend.strategies.base_strategy import StrategyBase
-from config.settings import settings
+from config.settings import get_settings
 
 
 class InstitutionalBuyingStrategy(StrategyBase):
@@ -34,11 +34,8 @@ class InstitutionalBuyingStrategy(StrategyBase):
     # 策略特定的數據需求
     required_data_keys = {"eps", "margin_buy", "margin_sell"}
 
-    def __init__(self):
-        super().__init__(
-            name="連兩日大戶大買超",
-            description="連續2日量增價漲且融資減少，推測主力吸籌"
-        )
+    name = "連兩日大戶大買超"
+    description = "連續2日量增價漲且融資減少，推測主力吸籌"
 
     def screen(
         self,
@@ -148,8 +145,8 @@ class InstitutionalBuyingStrategy(StrategyBase):
             data,
             min_price=20,
             max_price=200,
-            min_market_cap=settings.min_market_cap,
-            liquidity_percentile=settings.min_liquidity_percentile,
+            min_market_cap=get_settings().min_market_cap,
+            liquidity_percentile=get_settings().min_liquidity_percentile,
             exclude_attention=True,
             exclude_cash_delivery=True
         )
@@ -20,7 +20,7 @@ import pandas as pd
 import numpy as np
 from datetime import date
 from backend.strategies.base_strategy import StrategyBase
-from config.settings import settings
+from config.settings import get_settings
 
 
 class LowPriceSmallCapStrategy(StrategyBase):
@@ -29,11 +29,8 @@ class LowPriceSmallCapStrategy(StrategyBase):
     # 策略特定的數據需求
     required_data_keys = {"revenue", "roe", "dividend_announcement"}
 
-    def __init__(self):
-        super().__init__(
-            name="低價小股本營收創一年高",
-            description="選擇股價<100元、市值<100億、營收創新高的小型成長股"
-        )
+    name = "低價小股本營收創一年高"
+    description = "選擇股價<100元、市值<100億、營收創新高的小型成長股"
 
     def screen(
         self,
@@ -7,7 +7,9 @@ Test Industry Average Calculation Logic
 
 import pandas as pd
 import numpy as np
-from backend.data_sources.finlab_client import FinLabClient
+from datetime import date
+from backend.data_sources.finlab_client import FinLabClient, load_company_basic_info
+from backend.strategies.base_strategy import StrategyBase
 
 
 def test_industry_average_logic():
@@ -24,15 +26,13 @@ def test_industry_average_logic():
     client = FinLabClient()
 
     try:
-        # 獲取公司基本資訊
-        company_info = client._get_and_convert('company_basic_info')
-        if company_info.empty:
-            print("❌ 無法獲取 company_basic_info")
+        # 獲取公司基本資訊（與正式程式共用當日快取，已設 stock_id 為 index）
+        try:
+            company_info = load_company_basic_info(date.today().isoformat())
+        except RuntimeError as e:
+            print(f"❌ {e}")
             return False
 
-        # 設置 stock_id 為 index
-        company_info = company_info.set_index('stock_id')
-
         # 獲取產業分類
         industry_classification = company_info['產業類別']
         print(f"✅ 產業分類數據: {len(industry_classification)} 檔股票")
@@ -56,58 +56,60 @@ def test_industry_average_logic():
     # ==================== 2. 計算營收 YoY ====================
 
     print("📊 步驟 2：計算營收 YoY...")
-    revenue_yoy = revenue.pct_change(12, fill_method=None)
+    if len(revenue) < 13:
+        print("❌ 月營收數據不足 13 期，無法計算 YoY")
+        return False
 
-    # 取最新一期的 YoY
-    latest_yoy = revenue_yoy.iloc[-1]
+    # 只計算最新一期的 YoY（不需對整個營收表做 pct_change）
+    latest_yoy = revenue.iloc[-1] / revenue.iloc[-13].replace(0, np.nan) - 1
+    yoy_nan_count = np.count_nonzero(np.isnan(latest_yoy.to_numpy(dtype=float)))
     print(f"✅ 最新 YoY 數據: {len(latest_yoy)} 檔股票")
-    print(f"   - 有效數據: {latest_yoy.notna().sum()} 檔")
-    print(f"   - NaN 數據: {latest_yoy.isna().sum()} 檔")
+    print(f"   - 有效數據: {len(latest_yoy) - yoy_nan_count} 檔")
+    print(f"   - NaN 數據: {yoy_nan_count} 檔")
     print()
 
     # ==================== 3. 檢查數據對齊 ====================
 
     print("🔍 步驟 3：檢查數據對齊...")
 
-    # 檢查 index 對齊
-    industry_stocks = set(industry_classification.index)
-    yoy_stocks = set(latest_yoy.index)
-
-    common_stocks = industry_stocks & yoy_stocks
-    only_in_industry = industry_stocks - yoy_stocks
-    only_in_yoy = yoy_stocks - industry_stocks
+    # 檢查 index 對齊（使用 Index 集合運算，不需轉成 Python set）
+    common_stocks = industry_classification.index.intersection(latest_yoy.index)
+    only_in_industry = industry_classification.index.difference(latest_yoy.index)
+    only_in_yoy = latest_yoy.index.difference(industry_classification.index)
 
-    print(f"   - 產業分類股票數: {len(industry_stocks)}")
-    print(f"   - YoY 股票數: {len(yoy_stocks)}")
+    print(f"   - 產業分類股票數: {industry_classification.index.nunique()}")
+    print(f"   - YoY 股票數: {latest_yoy.index.nunique()}")
     print(f"   - 共同股票數: {len(common_stocks)}")
 
-    if only_in_industry:
+    if len(only_in_industry) > 0:
         print(f"   ⚠️  只在產業分類中: {len(only_in_industry)} 檔")
-        print(f"       範例: {list(only_in_industry)[:5]}")
+        print(f"       範例: {list(only_in_industry[:5])}")
 
-    if only_in_yoy:
+    if len(only_in_yoy) > 0:
         print(f"   ⚠️  只在 YoY 中: {len(only_in_yoy)} 檔")
-        print(f"       範例: {list(only_in_yoy)[:5]}")
+        print(f"       範例: {list(only_in_yoy[:5])}")
 
     print()
 
-    # ==================== 4. 對齊數據並測試 groupby ====================
+    # ==================== 4. 對齊數據並計算產業平均 ====================
 
-    print("🧮 步驟 4：測試 groupby 計算產業平均...")
+    print("🧮 步驟 4：分組計算產業平均...")
 
-    # 只使用共同股票
-    aligned_yoy = latest_yoy[latest_yoy.index.isin(common_stocks)]
-    aligned_industry = industry_classification[industry_classification.index.isin(common_stocks)]
+    # 只使用共同股票（兩者 reindex 到同一個 index，分組代碼與數值一一對應）
+    aligned_yoy = latest_yoy.reindex(common_stocks)
+    aligned_industry = industry_classification.reindex(common_stocks)
 
     try:
-        # 嘗試 groupby
-        industry_avg_yoy = aligned_yoy.groupby(aligned_industry).mean()
-        print(f"✅ Groupby 成功！")
+        # 產業代碼化後以 bincount 做分段平均（等同 groupby().mean()）
+        industry_codes, industries = pd.factorize(aligned_industry)
+        group_avg = StrategyBase.group_mean(aligned_yoy.to_numpy(dtype=float), industry_codes, len(industries))
+        industry_avg_yoy = pd.Series(group_avg, index=industries)
+        print(f"✅ 產業平均計算成功！")
         print(f"   - 計算出 {len(industry_avg_yoy)} 個產業的平均 YoY")
         print()
 
     except Exception as e:
-        print(f"❌ Groupby 失敗: {e}")
+        print(f"❌ 產業平均計算失敗: {e}")
         return False
 
     # ==================== 5. 產業統計分析 ====================
@@ -140,19 +142,22 @@ def test_industry_average_logic():
 
     print("🎯 步驟 6：測試比較邏輯...")
 
-    # 為每支股票映射其產業平均
-    stock_industry_avg = aligned_yoy.index.map(lambda stock: industry_avg_yoy.get(
-        aligned_industry.get(stock, None), np.nan
-    ))
-    stock_industry_avg = pd.Series(stock_industry_avg, index=aligned_yoy.index)
+    # 為每支股票取其產業平均（直接以產業代碼索引，等同 transform('mean')）
+    stock_industry_avg = pd.Series(
+        np.where(industry_codes >= 0, group_avg[industry_codes], np.nan),
+        index=aligned_yoy.index
+    )
 
-    # 判斷是否高於產業平均
-    above_industry_avg = aligned_yoy > stock_industry_avg
+    # 判斷是否高於產業平均（直接在 ndarray 上計數，NaN 比較結果為 False）
+    yoy_arr = aligned_yoy.to_numpy(dtype=float)
+    avg_arr = stock_industry_avg.to_numpy(dtype=float)
+    valid_count = np.count_nonzero(~np.isnan(yoy_arr) & ~np.isnan(avg_arr))
+    above_count = np.count_nonzero(yoy_arr > avg_arr)
 
     print(f"   - 總股票數: {len(aligned_yoy)}")
-    print(f"   - 有效比較: {above_industry_avg.notna().sum()} 檔")
-    print(f"   - 高於產業平均: {above_industry_avg.sum()} 檔 ({above_industry_avg.sum() / above_industry_avg.notna().sum():.1%})")
-    print(f"   - 低於產業平均: {(~above_industry_avg & above_industry_avg.notna()).sum()} 檔")
+    print(f"   - 有效比較: {valid_count} 檔")
+    print(f"   - 高於產業平均: {above_count} 檔 ({above_count / max(valid_count, 1):.1%})")
+    print(f"   - 低於產業平均: {valid_count - above_count} 檔")
     print()
 
     # ==================== 7. 具體案例驗證 ====================
@@ -220,11 +225,11 @@ def test_industry_average_logic():
     print("=" * 70)
     print()
     print("📊 總結：")
-    print(f"   1. Groupby 邏輯: ✅ 可行")
+    print(f"   1. 產業平均邏輯: ✅ 可行")
     print(f"   2. 數據對齊: {'✅ 完全對齊' if len(only_in_industry) == 0 and len(only_in_yoy) == 0 else '⚠️  部分不對齊'}")
     print(f"   3. 產業數量: {len(industry_avg_yoy)} 個")
     print(f"   4. 單一股票產業: {len(single_stock_industries)} 個 {'(需注意)' if len(single_stock_industries) > 5 else ''}")
-    print(f"   5. NaN 處理: ✅ Groupby.mean() 自動忽略 NaN")
+    print(f"   5. NaN 處理: ✅ 分組平均自動忽略 NaN")
     print()
 
     return True
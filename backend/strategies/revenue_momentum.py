@@ -12,12 +12,18 @@ Strategy 1: Revenue Momentum Above Industry Average
 參考來源: reference/stockCC-claude/finlab_實戰策略範例.py - taiwan_earnings_momentum_strategy
 """
 
+import logging
 from typing import Dict, Optional
 import pandas as pd
 import numpy as np
 from datetime import date
 from backend.strategies.base_strategy import StrategyBase
-from config.settings import settings
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 空結果模板（回傳時 copy，避免呼叫端修改到共用物件）
+_EMPTY_RESULT = pd.DataFrame(columns=['stock_id', 'score', 'rank', 'metadata'])
 
 
 class RevenueMomentumStrategy(StrategyBase):
@@ -26,16 +32,14 @@ class RevenueMomentumStrategy(StrategyBase):
     # 策略特定的數據需求
     required_data_keys = {"revenue", "revenue_yoy", "revenue_mom", "industry"}
 
-    def __init__(self):
-        super().__init__(
-            name="營收動能高於同業平均",
-            description="選擇月營收YoY>20%且持續成長的股票，價格<150元"
-        )
+    name = "營收動能高於同業平均"
+    description = "選擇月營收YoY>20%且持續成長的股票，價格<150元"
 
     def screen(
         self,
         data: Dict[str, pd.DataFrame],
-        as_of: Optional[date] = None
+        as_of: Optional[date] = None,
+        verbose: bool = False
     ) -> pd.DataFrame:
         """
         執行營收動能選股
@@ -43,100 +47,124 @@ class RevenueMomentumStrategy(StrategyBase):
         Args:
             data: 包含revenue, revenue_yoy, revenue_mom, close等數據
             as_of: 選股基準日期
+            verbose: 是否以 INFO 等級輸出執行過程（預設 False，以 DEBUG 等級輸出）
 
         Returns:
             選股結果DataFrame
         """
-        print(f"\n{'='*70}")
-        print(f"🚀 執行策略: {self.name}")
-        print(f"{'='*70}\n")
+        info = logger.info if verbose else logger.debug
+        # 各條件的統計（sum 等）只在 DEBUG 啟用時才計算
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        info('=' * 70)
+        info("🚀 執行策略: %s", self.name)
+        info('=' * 70)
 
         # 獲取必要數據
-        revenue = data.get('revenue', pd.DataFrame())
-        revenue_yoy = data.get('revenue_yoy', pd.DataFrame())
-        revenue_mom = data.get('revenue_mom', pd.DataFrame())
-        close = data.get('close', pd.DataFrame())
+        revenue = data.get('revenue')
+        revenue_yoy = data.get('revenue_yoy')
+        revenue_mom = data.get('revenue_mom')
+        close = data.get('close')
 
         # 檢查數據完整性
-        if revenue.empty or revenue_yoy.empty or close.empty:
-            print("❌ 缺少必要數據（營收或價格）")
-            return pd.DataFrame(columns=['stock_id', 'score', 'rank', 'metadata'])
+        if (revenue is None or revenue.empty or revenue_yoy is None or revenue_yoy.empty
+                or close is None or close.empty):
+            logger.warning("❌ 缺少必要數據（營收或價格）")
+            return _EMPTY_RESULT.copy()
 
-        print(f"📊 數據範圍:")
-        print(f"   營收數據: {revenue.shape}")
-        print(f"   價格數據: {close.shape}")
-        print(f"   最新日期: {revenue.index[-1] if len(revenue) > 0 else 'N/A'}")
-        print()
+        has_mom = revenue_mom is not None and not revenue_mom.empty
+
+        logger.debug("📊 數據範圍: 營收 %s, 價格 %s, 最新日期 %s", revenue.shape, close.shape, revenue.index[-1])
+
+        # 最新一期數據先對齊到營收股票序列，後續條件皆為同長度的布林 ndarray
+        latest_yoy = data['latest_yoy'] if 'latest_yoy' in data else revenue_yoy.iloc[-1]
+        stock_index = latest_yoy.index
+        n_stocks = len(stock_index)
+        latest_mom = revenue_mom.iloc[-1].reindex(stock_index) if has_mom else pd.Series(np.nan, index=stock_index)
+        latest_close = close.iloc[-1].reindex(stock_index)
+        yoy_values = latest_yoy.to_numpy()
 
         # ========== 條件1: 營收年增率 > 20% ==========
-        print("📈 條件1: 營收年增率 > 20%")
-        latest_yoy = revenue_yoy.iloc[-1]
-        cond1 = latest_yoy > 0.20
-        print(f"   符合條件: {cond1.sum()} 檔")
+        info("📈 條件1: 營收年增率 > 20%")
+        cond1 = yoy_values > 0.20
+        if debug:
+            logger.debug("   符合條件: %d 檔", cond1.sum())
 
         # ========== 條件2: 營收月增率 > 0（持續成長）==========
-        print("📈 條件2: 營收月增率 > 0")
-        latest_mom = revenue_mom.iloc[-1] if not revenue_mom.empty else pd.Series()
-        cond2 = latest_mom > 0 if not latest_mom.empty else pd.Series(True, index=cond1.index)
-        print(f"   符合條件: {cond2.sum()} 檔")
+        info("📈 條件2: 營收月增率 > 0")
+        cond2 = latest_mom.to_numpy() > 0 if has_mom else np.ones(n_stocks, dtype=bool)
+        if debug:
+            logger.debug("   符合條件: %d 檔", cond2.sum())
 
         # ========== 條件3: 營收加速（近3個月YoY上升）==========
-        print("📈 條件3: 營收動能加速（3個月趨勢向上）")
+        info("📈 條件3: 營收動能加速（3個月趨勢向上）")
         if len(revenue_yoy) >= 3:
             # 計算近3個月YoY的斜率
             recent_yoy = revenue_yoy.iloc[-3:]
-            yoy_trend = recent_yoy.apply(lambda x: self._calculate_trend(x), axis=0)
-            cond3 = yoy_trend > 0
+            recent_arr = recent_yoy.to_numpy(dtype=float)
+            # x = [0, 1, 2] 時 OLS 斜率的閉式解為 (y2 - y0) / 2，整欄一次算完
+            yoy_trend = pd.Series((recent_arr[2] - recent_arr[0]) / 2.0, index=recent_yoy.columns)
+            # 含 NaN 的股票退回一般解（去除 NaN 後回歸）
+            has_nan = np.isnan(recent_arr).any(axis=0)
+            if has_nan.any():
+                yoy_trend[has_nan] = recent_yoy.loc[:, has_nan].apply(self._calculate_trend, axis=0)
+            yoy_trend = yoy_trend.reindex(stock_index)
+            cond3 = yoy_trend.to_numpy() > 0
         else:
-            cond3 = pd.Series(True, index=cond1.index)
-        print(f"   符合條件: {cond3.sum()} 檔")
+            yoy_trend = pd.Series(0.0, index=stock_index)
+            cond3 = np.ones(n_stocks, dtype=bool)
+        if debug:
+            logger.debug("   符合條件: %d 檔", cond3.sum())
 
         # ========== 條件4: 高於產業中位數 ==========
-        print("📊 條件4: 營收YoY高於產業中位數")
+        info("📊 條件4: 營收YoY高於產業中位數")
         industry_median = latest_yoy.median()
-        cond4 = latest_yoy > industry_median
-        print(f"   產業中位數: {industry_median:.2%}")
-        print(f"   符合條件: {cond4.sum()} 檔")
+        cond4 = yoy_values > industry_median
+        if debug:
+            logger.debug("   產業中位數: %.2f%%", industry_median * 100)
+            logger.debug("   符合條件: %d 檔", cond4.sum())
 
         # ========== 條件5: 價格 < 150 元 ==========
-        print("💰 條件5: 股價 < 150 元")
-        latest_close = close.iloc[-1]
-        cond5 = latest_close < 150
-        print(f"   符合條件: {cond5.sum()} 檔")
+        info("💰 條件5: 股價 < 150 元")
+        cond5 = latest_close.to_numpy() < 150
+        if debug:
+            logger.debug("   符合條件: %d 檔", cond5.sum())
 
         # ========== 基本篩選 ==========
-        print("\n🔍 應用基本篩選條件...")
+        info("🔍 應用基本篩選條件...")
         basic_filter = self.apply_basic_filters(
             data,
             min_price=10,  # 最低10元
             max_price=150,  # 最高150元
-            min_market_cap=settings.min_market_cap,
-            liquidity_percentile=settings.min_liquidity_percentile,
+            min_market_cap=get_settings().min_market_cap,
+            liquidity_percentile=get_settings().min_liquidity_percentile,
             exclude_attention=True,
             exclude_cash_delivery=True
-        )
-        print(f"   基本篩選後: {basic_filter.sum()} 檔")
+        ).reindex(stock_index, fill_value=False).to_numpy(dtype=bool)
+        if debug:
+            logger.debug("   基本篩選後: %d 檔", basic_filter.sum())
 
         # ========== 綜合條件 ==========
-        print("\n🎯 整合所有條件...")
-        final_condition = cond1 & cond2 & cond3 & cond4 & cond5 & basic_filter
+        info("🎯 整合所有條件...")
+        # 堆疊成 (條件數, 股票數) 的布林矩陣，一次完成 AND
+        masks = np.vstack([cond1, cond2, cond3, cond4, cond5, basic_filter])
+        final_mask = masks.all(axis=0)
 
-        selected_stocks = final_condition[final_condition].index.tolist()
-        print(f"   最終選出: {len(selected_stocks)} 檔股票")
+        selected_stocks = stock_index[final_mask].tolist()
+        info("   最終選出: %d 檔股票", len(selected_stocks))
 
         if not selected_stocks:
-            print("\n⚠️  無符合條件的股票")
-            return pd.DataFrame(columns=['stock_id', 'score', 'rank', 'metadata'])
+            info("⚠️  無符合條件的股票")
+            return _EMPTY_RESULT.copy()
 
         # ========== 計算綜合評分 ==========
-        print("\n📊 計算綜合評分...")
+        info("📊 計算綜合評分...")
 
         # 標準化各因子
         yoy_z = self.standardize(revenue_yoy.iloc[-1:]).iloc[0]
-        mom_z = self.standardize(revenue_mom.iloc[-1:]).iloc[0] if not revenue_mom.empty else pd.Series(0, index=latest_yoy.index)
+        mom_z = self.standardize(revenue_mom.iloc[-1:]).iloc[0] if has_mom else pd.Series(0, index=stock_index)
 
         # 綜合評分: YoY 60% + MoM 20% + Trend 20%
-        scores = pd.Series(0.0, index=latest_yoy.index)
         scores = (
             0.6 * yoy_z.fillna(0) +
             0.2 * mom_z.fillna(0) +
@@ -163,10 +191,12 @@ class RevenueMomentumStrategy(StrategyBase):
         result['mom'] = result['stock_id'].map(latest_mom)
         result['price'] = result['stock_id'].map(latest_close)
 
-        print("\n✅ 選股完成!")
-        print(f"\n前10名股票:")
-        print(result.head(10)[['stock_id', 'score', 'yoy', 'mom', 'price']].to_string(index=False))
-        print(f"\n{'='*70}\n")
+        info("✅ 選股完成!")
+        if debug:
+            # 表格字串化成本較高，只在需要時才產生
+            top10 = result.head(10)[['stock_id', 'score', 'yoy', 'mom', 'price']].to_string(index=False)
+            logger.debug("前10名股票:\n%s", top10)
+        info('=' * 70)
 
         return result
 
@@ -270,4 +300,6 @@ def test_revenue_momentum_strategy():
 
 
 if __name__ == "__main__":
+    from config.settings import configure_logging
+    configure_logging()
     test_revenue_momentum_strategy()
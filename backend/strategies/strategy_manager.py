@@ -5,32 +5,40 @@ Strategy Manager
 統一管理所有選股策略，提供便捷的調用接口
 """
 
-from typing import Dict, List, Optional
+import logging
+import importlib
+from typing import Dict, List, Optional, Type
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from datetime import date
+from backend.strategies.base_strategy import StrategyBase
 
-# 導入所有策略
-from backend.strategies.revenue_momentum import RevenueMomentumStrategy
-from backend.strategies.low_price_small import LowPriceSmallCapStrategy
-from backend.strategies.breakout import BreakoutAfterBaseStrategy
-from backend.strategies.inst_buying import InstitutionalBuyingStrategy
-from backend.strategies.capital_increase import CapitalIncreaseStrategy
-from backend.strategies.cash_growth import CashGrowthStrategy
+logger = logging.getLogger(__name__)
+
+# 策略註冊表 {key: (模組路徑, 類別名稱)}，首次使用時才導入並實例化
+STRATEGY_REGISTRY = {
+    'revenue_momentum': ('backend.strategies.revenue_momentum', 'RevenueMomentumStrategy'),
+    'low_price_small': ('backend.strategies.low_price_small', 'LowPriceSmallCapStrategy'),
+    'breakout': ('backend.strategies.breakout', 'BreakoutAfterBaseStrategy'),
+    'inst_buying': ('backend.strategies.inst_buying', 'InstitutionalBuyingStrategy'),
+    'capital_increase': ('backend.strategies.capital_increase', 'CapitalIncreaseStrategy'),
+    'cash_growth': ('backend.strategies.cash_growth', 'CashGrowthStrategy'),
+}
 
 
 class StrategyManager:
     """策略管理器"""
 
-    def __init__(self):
-        """初始化所有策略"""
-        self.strategies = {
-            'revenue_momentum': RevenueMomentumStrategy(),
-            'low_price_small': LowPriceSmallCapStrategy(),
-            'breakout': BreakoutAfterBaseStrategy(),
-            'inst_buying': InstitutionalBuyingStrategy(),
-            'capital_increase': CapitalIncreaseStrategy(),
-            'cash_growth': CashGrowthStrategy()
-        }
+    def __init__(self, parallel: bool = True):
+        """
+        初始化策略管理器（策略延遲到首次使用時才導入並實例化）
+
+        Args:
+            parallel: 是否以多執行緒並行執行所有策略（False 便於除錯）
+        """
+        self.parallel = parallel
+        self._registry = STRATEGY_REGISTRY
+        self._instances: Dict[str, StrategyBase] = {}
 
     def get_strategy(self, strategy_name: str):
         """
@@ -42,10 +50,26 @@ class StrategyManager:
         Returns:
             策略實例
         """
-        if strategy_name not in self.strategies:
+        if strategy_name not in self._registry:
             raise ValueError(f"未知策略: {strategy_name}")
 
-        return self.strategies[strategy_name]
+        if strategy_name not in self._instances:
+            self._instances[strategy_name] = self._strategy_class(strategy_name)()
+
+        return self._instances[strategy_name]
+
+    def _strategy_class(self, strategy_name: str) -> Type[StrategyBase]:
+        """
+        依註冊表導入策略類別（只導入模組，不實例化）
+
+        Args:
+            strategy_name: 策略名稱
+
+        Returns:
+            策略類別
+        """
+        module_path, class_name = self._registry[strategy_name]
+        return getattr(importlib.import_module(module_path), class_name)
 
     def list_strategies(self) -> List[Dict[str, str]]:
         """
@@ -57,12 +81,34 @@ class StrategyManager:
         return [
             {
                 'key': key,
-                'name': strategy.name,
-                'description': strategy.description
+                'name': strategy_cls.name,
+                'description': strategy_cls.description
             }
-            for key, strategy in self.strategies.items()
+            for key, strategy_cls in ((key, self._strategy_class(key)) for key in self._registry)
         ]
 
+    @staticmethod
+    def precompute(data: Dict[str, pd.DataFrame]) -> None:
+        """
+        預先計算多個策略共用的衍生數據（直接寫入 data，已存在的鍵不會重算）
+
+        並行執行策略前應先在呼叫端（單一執行緒）呼叫一次，
+        之後各策略只讀取 data，run_strategy 內的呼叫僅做鍵存在檢查。
+
+        Args:
+            data: 數據字典
+        """
+        revenue = data.get('revenue')
+        if revenue is not None and not revenue.empty:
+            if 'revenue_yoy' not in data:
+                data['revenue_yoy'] = revenue.pct_change(12, fill_method=None)
+            if 'revenue_mom' not in data:
+                data['revenue_mom'] = revenue.pct_change(1, fill_method=None)
+
+        revenue_yoy = data.get('revenue_yoy')
+        if 'latest_yoy' not in data and revenue_yoy is not None and not revenue_yoy.empty:
+            data['latest_yoy'] = revenue_yoy.iloc[-1]
+
     def run_strategy(
         self,
         strategy_name: str,
@@ -74,12 +120,14 @@ class StrategyManager:
 
         Args:
             strategy_name: 策略名稱
-            data: 數據字典
+            data: 數據字典（可預先放入 revenue_yoy / revenue_mom / latest_yoy，
+                  否則會由 revenue 計算一次並寫回 data，供後續策略共用）
             as_of: 選股基準日期
 
         Returns:
             選股結果DataFrame
         """
+        self.precompute(data)
         strategy = self.get_strategy(strategy_name)
         return strategy.screen(data, as_of)
 
@@ -98,30 +146,56 @@ class StrategyManager:
         Returns:
             策略結果字典 {strategy_name: result_df}
         """
-        print("\n" + "=" * 70)
-        print("🚀 開始執行所有策略")
-        print("=" * 70)
+        logger.info("=" * 70)
+        logger.info("🚀 開始執行所有策略")
+        logger.info("=" * 70)
+
+        # 共用的衍生數據只計算一次
+        self.precompute(data)
 
+        strategies = {key: self.get_strategy(key) for key in self._registry}
         results = {}
+        errors = {}
+
+        if self.parallel:
+            # pandas/NumPy 運算大多釋放 GIL，各策略只讀取 data，可安全並行
+            with ThreadPoolExecutor(max_workers=len(strategies)) as pool:
+                futures = {
+                    pool.submit(strategy.screen, data, as_of): key
+                    for key, strategy in strategies.items()
+                }
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        errors[key] = e
+        else:
+            for key, strategy in strategies.items():
+                try:
+                    logger.info(f"執行策略: {strategy.name}")
+                    results[key] = strategy.screen(data, as_of)
+                except Exception as e:
+                    errors[key] = e
+
+        # 依策略順序輸出結果
+        for key, strategy in strategies.items():
+            if key in errors:
+                logger.error(f"❌ {strategy.name} 執行失敗: {errors[key]}")
+                results[key] = pd.DataFrame(columns=['stock_id', 'score', 'rank', 'metadata'])
+                continue
 
-        for key, strategy in self.strategies.items():
-            try:
-                print(f"\n執行策略: {strategy.name}")
-                result = strategy.screen(data, as_of)
-                results[key] = result
+            result = results[key]
+            if not result.empty:
+                logger.info(f"✅ {strategy.name} 完成，選出 {len(result)} 檔股票")
+            else:
+                logger.info(f"⚠️  {strategy.name} 無符合條件的股票")
 
-                if not result.empty:
-                    print(f"✅ {strategy.name} 完成，選出 {len(result)} 檔股票")
-                else:
-                    print(f"⚠️  {strategy.name} 無符合條件的股票")
+        results = {key: results[key] for key in strategies}
 
-            except Exception as e:
-                print(f"❌ {strategy.name} 執行失敗: {e}")
-                results[key] = pd.DataFrame(columns=['stock_id', 'score', 'rank', 'metadata'])
-
-        print("\n" + "=" * 70)
-        print("✅ 所有策略執行完成")
-        print("=" * 70)
+        logger.info("=" * 70)
+        logger.info("✅ 所有策略執行完成")
+        logger.info("=" * 70)
 
         return results
 
@@ -140,28 +214,25 @@ class StrategyManager:
         Returns:
             合併後的DataFrame，包含所有策略的推薦股票
         """
-        combined = []
-
-        for strategy_key, result in results.items():
-            if result.empty:
-                continue
-
-            # 取前N名
-            if top_n:
-                result = result.head(top_n)
-
-            # 添加策略標識
-            result = result.copy()
-            result['strategy_key'] = strategy_key
-            result['strategy_name'] = self.strategies[strategy_key].name
-
-            combined.append(result)
+        selected = [
+            (strategy_key, result.head(top_n) if top_n else result)
+            for strategy_key, result in results.items()
+            if not result.empty
+        ]
 
-        if not combined:
+        if not selected:
             return pd.DataFrame()
 
-        # 合併所有結果
-        combined_df = pd.concat(combined, ignore_index=True)
+        # 合併所有結果（以 keys 標記策略，concat 本身即產生新物件，不需逐一 copy）
+        combined_df = pd.concat(
+            [result for _, result in selected],
+            keys=[strategy_key for strategy_key, _ in selected],
+            names=['strategy_key', None]
+        ).reset_index(level='strategy_key').reset_index(drop=True)
+
+        # 添加策略名稱
+        name_map = {strategy_key: self._strategy_class(strategy_key).name for strategy_key, _ in selected}
+        combined_df['strategy_name'] = combined_df['strategy_key'].map(name_map)
 
         return combined_df
 
@@ -178,45 +249,31 @@ class StrategyManager:
         Returns:
             股票統計DataFrame，包含出現次數、平均評分等
         """
-        stock_stats = {}
-
-        for strategy_key, result in results.items():
-            if result.empty:
-                continue
-
-            for _, row in result.iterrows():
-                stock_id = row['stock_id']
-
-                if stock_id not in stock_stats:
-                    stock_stats[stock_id] = {
-                        'stock_id': stock_id,
-                        'appearances': 0,
-                        'strategies': [],
-                        'scores': [],
-                        'avg_rank': 0
-                    }
-
-                stock_stats[stock_id]['appearances'] += 1
-                stock_stats[stock_id]['strategies'].append(self.strategies[strategy_key].name)
-                stock_stats[stock_id]['scores'].append(row['score'])
+        selected = {
+            strategy_key: result[['stock_id', 'score']]
+            for strategy_key, result in results.items()
+            if not result.empty
+        }
 
-        if not stock_stats:
+        if not selected:
             return pd.DataFrame()
 
-        # 轉換為DataFrame
-        stats_df = pd.DataFrame(stock_stats.values())
-
-        # 計算平均評分
-        stats_df['avg_score'] = stats_df['scores'].apply(lambda x: sum(x) / len(x))
-
-        # 策略列表轉為字串
-        stats_df['strategies_list'] = stats_df['strategies'].apply(lambda x: ', '.join(x))
+        # 合併所有策略結果（以 keys 標記策略，欄位式一次 groupby 彙總）
+        all_selections = pd.concat(selected, names=['strategy_key', None]).reset_index(level='strategy_key')
+        all_selections['strategy_name'] = all_selections['strategy_key'].map(
+            {strategy_key: self._strategy_class(strategy_key).name for strategy_key in selected}
+        )
+        stats_df = all_selections.groupby('stock_id').agg(
+            appearances=('strategy_name', 'size'),
+            avg_score=('score', 'mean'),
+            strategies_list=('strategy_name', ', '.join)
+        )
 
         # 按出現次數和平均分數排序
         stats_df = stats_df.sort_values(['appearances', 'avg_score'], ascending=[False, False])
 
         # 選擇展示欄位
-        display_df = stats_df[['stock_id', 'appearances', 'avg_score', 'strategies_list']].reset_index(drop=True)
+        display_df = stats_df.reset_index()[['stock_id', 'appearances', 'avg_score', 'strategies_list']]
 
         return display_df
 
@@ -281,4 +338,6 @@ def test_strategy_manager():
 
 
 if __name__ == "__main__":
+    from config.settings import configure_logging
+    configure_logging()
     test_strategy_manager()
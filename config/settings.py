@@ -7,64 +7,95 @@ Patterns copied from reference, adapted for KevinRule project
 """
 
 import os
+import logging
+import warnings
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
-from dotenv import load_dotenv
+from dotenv import load_dotenv, dotenv_values
+
+# 啟動前就存在於程序環境的變數（真實環境變數，例如 Railway 注入）；優先於 .env，reload 時不覆寫
+_PROCESS_ENV_KEYS = frozenset(os.environ)
 
 # 加載環境變數
 load_dotenv()
 
-class Settings:
-    """應用程式設定"""
+# os.environ 的本地參考（load_dotenv 會直接寫入同一個 mapping）
+_environ = os.environ
+
+
+def _env(key: str, default: str = ''):
+    """建立讀取字串環境變數的 default_factory"""
+    return lambda: _environ.get(key, default)
+
+
+def _env_int(key: str, default: str):
+    """建立讀取整數環境變數的 default_factory"""
+    return lambda: int(_environ.get(key, default))
 
-    def __init__(self):
-        # 項目根目錄
-        self.project_root = Path(__file__).parent.parent
 
-        # API Keys
-        self.finlab_api_key = os.getenv('FINLAB_API_KEY', '')
-        self.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY', '')
-        self.line_notify_token = os.getenv('LINE_NOTIFY_TOKEN', '')
-        self.trading_economics_api_key = os.getenv('TRADING_ECONOMICS_API_KEY', '')
+def _env_float(key: str, default: str):
+    """建立讀取浮點數環境變數的 default_factory"""
+    return lambda: float(_environ.get(key, default))
 
-        # Email配置
-        self.email_smtp_host = os.getenv('EMAIL_SMTP_HOST', 'smtp.gmail.com')
-        self.email_smtp_port = int(os.getenv('EMAIL_SMTP_PORT', '587'))
-        self.email_username = os.getenv('EMAIL_USERNAME', '')
-        self.email_password = os.getenv('EMAIL_PASSWORD', '')
-        self.email_recipient = os.getenv('EMAIL_RECIPIENT', '')
 
-        # 資料庫路徑
-        self.duckdb_path = os.getenv('DUCKDB_PATH', 'data/kevinrule.duckdb')
+def _env_bool(key: str, default: str):
+    """建立讀取布林環境變數的 default_factory"""
+    return lambda: _environ.get(key, default).lower() == 'true'
 
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """應用程式設定"""
+
+    # 項目根目錄
+    project_root: Path = field(default_factory=lambda: Path(__file__).parent.parent)
+
+    # API Keys
+    finlab_api_key: str = field(default_factory=_env('FINLAB_API_KEY'))
+    anthropic_api_key: str = field(default_factory=_env('ANTHROPIC_API_KEY'))
+    line_notify_token: str = field(default_factory=_env('LINE_NOTIFY_TOKEN'))
+    trading_economics_api_key: str = field(default_factory=_env('TRADING_ECONOMICS_API_KEY'))
+
+    # Email配置
+    email_smtp_host: str = field(default_factory=_env('EMAIL_SMTP_HOST', 'smtp.gmail.com'))
+    email_smtp_port: int = field(default_factory=_env_int('EMAIL_SMTP_PORT', '587'))
+    email_username: str = field(default_factory=_env('EMAIL_USERNAME'))
+    email_password: str = field(default_factory=_env('EMAIL_PASSWORD'))
+    email_recipient: str = field(default_factory=_env('EMAIL_RECIPIENT'))
+
+    # 資料庫路徑
+    duckdb_path: str = field(default_factory=_env('DUCKDB_PATH', 'data/kevinrule.duckdb'))
+
+    # 應用程式配置
+    app_env: str = field(default_factory=_env('APP_ENV', 'development'))
+    log_level: str = field(default_factory=_env('LOG_LEVEL', 'INFO'))
+    disable_auto_gc: bool = field(default_factory=_env_bool('DISABLE_AUTO_GC', 'false'))  # 啟用時改為 Streamlit rerun 結束後手動 GC
+
+    # 回測設定
+    backtest_start_date: str = field(default_factory=_env('BACKTEST_START_DATE', '2020-01-01'))
+    backtest_commission: float = field(default_factory=_env_float('BACKTEST_COMMISSION', '0.001425'))
+    backtest_tax: float = field(default_factory=_env_float('BACKTEST_TAX', '0.003'))
+    backtest_slippage: float = field(default_factory=_env_float('BACKTEST_SLIPPAGE', '0.001'))
+
+    # 策略設定
+    max_positions: int = field(default_factory=_env_int('MAX_POSITIONS', '30'))
+    rebalance_frequency: str = field(default_factory=_env('REBALANCE_FREQUENCY', 'M'))
+    min_market_cap: float = field(default_factory=_env_float('MIN_MARKET_CAP', '500000000'))  # 降低到5億
+    min_liquidity_percentile: float = field(default_factory=_env_float('MIN_LIQUIDITY_PERCENTILE', '0.3'))
+
+    # 提醒設定
+    alert_cooldown_hours: int = field(default_factory=_env_int('ALERT_COOLDOWN_HOURS', '24'))
+    enable_line_notify: bool = field(default_factory=_env_bool('ENABLE_LINE_NOTIFY', 'true'))
+    enable_email_notify: bool = field(default_factory=_env_bool('ENABLE_EMAIL_NOTIFY', 'false'))
+
+    def __post_init__(self):
         # 確保資料目錄存在
-        data_dir = self.project_root / 'data'
-        data_dir.mkdir(exist_ok=True)
+        (self.project_root / 'data').mkdir(exist_ok=True)
 
         # 日誌目錄
-        log_dir = self.project_root / 'logs'
-        log_dir.mkdir(exist_ok=True)
-
-        # 應用程式配置
-        self.app_env = os.getenv('APP_ENV', 'development')
-        self.log_level = os.getenv('LOG_LEVEL', 'INFO')
-
-        # 回測設定
-        self.backtest_start_date = os.getenv('BACKTEST_START_DATE', '2020-01-01')
-        self.backtest_commission = float(os.getenv('BACKTEST_COMMISSION', '0.001425'))
-        self.backtest_tax = float(os.getenv('BACKTEST_TAX', '0.003'))
-        self.backtest_slippage = float(os.getenv('BACKTEST_SLIPPAGE', '0.001'))
-
-        # 策略設定
-        self.max_positions = int(os.getenv('MAX_POSITIONS', '30'))
-        self.rebalance_frequency = os.getenv('REBALANCE_FREQUENCY', 'M')
-        self.min_market_cap = float(os.getenv('MIN_MARKET_CAP', '500000000'))  # 降低到5億
-        self.min_liquidity_percentile = float(os.getenv('MIN_LIQUIDITY_PERCENTILE', '0.3'))
-
-        # 提醒設定
-        self.alert_cooldown_hours = int(os.getenv('ALERT_COOLDOWN_HOURS', '24'))
-        self.enable_line_notify = os.getenv('ENABLE_LINE_NOTIFY', 'true').lower() == 'true'
-        self.enable_email_notify = os.getenv('ENABLE_EMAIL_NOTIFY', 'false').lower() == 'true'
+        (self.project_root / 'logs').mkdir(exist_ok=True)
 
     def validate(self) -> tuple[bool, list[str]]:
         """驗證必要的配置是否已設定"""
@@ -85,8 +116,51 @@ class Settings:
         is_valid = len([e for e in errors if e.startswith("❌")]) == 0
         return is_valid, errors
 
-# 全局設定實例
-settings = Settings()
+# 設定單例（環境變數只解析一次；所有模組皆於使用時呼叫 get_settings()，reload 後即讀到新設定）
+get_settings = functools.lru_cache(maxsize=1)(Settings)
+
+
+def __getattr__(name: str):
+    """
+    已棄用的模組屬性 settings（向下相容）
+
+    每次存取都回傳目前的 get_settings()，不會持有過期的設定實例。
+    """
+    if name == 'settings':
+        warnings.warn(
+            "config.settings.settings 已棄用，請改用 get_settings()",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def reload_settings() -> Settings:
+    """
+    重新讀取 .env 並重建設定單例
+
+    與啟動時相同，真實環境變數優先於 .env；其餘變數一律以 .env 目前內容覆寫，
+    因此修改既有的鍵（例如 FINLAB_API_KEY）也會在 reload 後生效。
+
+    Returns:
+        Settings: 新的設定實例
+    """
+    for key, value in dotenv_values().items():
+        if value is not None and key not in _PROCESS_ENV_KEYS:
+            _environ[key] = value
+    get_settings.cache_clear()
+    return get_settings()
+
+def configure_logging() -> None:
+    """
+    設定全域日誌（單一 StreamHandler，等級由 LOG_LEVEL 控制）
+
+    由程式進入點（frontend/app.py、各模組的 __main__）呼叫，匯入設定模組本身不會改動日誌設定。
+    handler 只在第一次呼叫時建立；等級每次呼叫都會依目前設定更新，reload_settings 後即可生效。
+    """
+    logging.basicConfig(format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    logging.getLogger().setLevel(get_settings().log_level.upper())
 
 # FinLab登入狀態（全局單例模式，參考 reference/config.py）
 _finlab_logged_in = False
@@ -115,7 +189,7 @@ def ensure_finlab_login(force: bool = False, verbose: bool = True) -> bool:
     try:
         import finlab
 
-        api_key = settings.finlab_api_key
+        api_key = get_settings().finlab_api_key
         if not api_key:
             raise ValueError("未找到FINLAB_API_KEY，請檢查.env檔案")
 
@@ -152,7 +226,7 @@ if __name__ == "__main__":
     print()
 
     # 驗證配置
-    is_valid, errors = settings.validate()
+    is_valid, errors = get_settings().validate()
 
     if errors:
         print("配置檢查結果:")
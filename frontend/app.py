@@ -7,24 +7,30 @@ Streamlit 主應用程式
 - Claude AI 智能分析
 - 自選股追蹤
 - 回測驗證
+
+以 st.navigation 宣告頁面：頁面配置、主題 CSS、idle 計時器與側邊欄
+只在此處執行一次，切換頁面時僅執行所選頁面的內容
 """
 
 import streamlit as st
 import sys
 import os
+import gc
 import threading
+import time
+import importlib
 from pathlib import Path
 
-# 添加專案根目錄到 Python 路徑
+# 添加專案根目錄到 Python 路徑（每次 rerun 都會執行，已存在時不重複加入；各頁面共用此設定）
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
-from config.settings import settings
-from frontend.theme import Theme, get_theme_toggle_label
+from config.settings import configure_logging, get_settings, reload_settings
+from frontend.home_content import WELCOME_INFO_MD
 
 # ========== 主題初始化 ==========
-if 'theme' not in st.session_state:
-    st.session_state.theme = 'dark'  # 預設深色主題
+st.session_state.setdefault('theme', 'dark')  # 預設深色主題
 
 # ========== 頁面配置 ==========
 
@@ -35,37 +41,76 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ========== 應用主題 CSS ==========
-st.markdown(Theme.generate_css(st.session_state.theme), unsafe_allow_html=True)
+# ========== 配置檢查（快取，避免每次 rerun 重新驗證）==========
 
-# ========== Idle Auto-Exit（Railway Serverless Sleep）==========
+def _env_mtime() -> float:
+    """.env 的修改時間（不存在時為 0，例如 Railway 直接注入環境變數）"""
+    env_path = project_root / '.env'
+    return env_path.stat().st_mtime if env_path.exists() else 0.0
 
-IDLE_TIMEOUT = 600  # 10 分鐘無操作自動退出（秒）
+@st.cache_resource
+def _env_state() -> dict:
+    """
+    記錄目前設定對應的 .env 修改時間（程序層級單例，所有 session 共用）
 
-# 全域 idle 計時器（在 Streamlit 多次 rerun 之間共用）
-if "idle_timer" not in globals():
-    idle_timer = None
+    Returns:
+        共用狀態字典
+    """
+    return {"env_mtime": _env_mtime()}
 
-def _exit_app():
-    """Idle 超時後退出應用，讓 Railway 進入 Sleep 狀態"""
-    print("⏰ Idle timeout reached. Exiting app so Railway can scale to zero.")
-    os._exit(0)  # 強制結束程式，讓 Railway 把容器關掉
+@st.cache_resource
+def _validate_settings():
+    """
+    驗證目前的系統配置（所有 session 共用；重新載入配置時清除）
+
+    Returns:
+        (is_valid, errors)
+    """
+    return get_settings().validate()
+
+def _reload_settings():
+    """重新讀取 .env 並重建設定，清除驗證快取"""
+    _env_state()["env_mtime"] = _env_mtime()
+    reload_settings()
+    _validate_settings.clear()
+
+# .env 變更後自動重新載入（stat 很便宜；reload 只在修改時間改變時執行）
+if _env_mtime() != _env_state()["env_mtime"]:
+    _reload_settings()
+
+is_valid, errors = _validate_settings()
+
+# 日誌設定（每次 rerun 依目前設定更新等級，重新載入配置後 LOG_LEVEL 即生效）
+configure_logging()
+
+# 配置不完整時只顯示設定指引，不送出主題 CSS、側邊欄與任何頁面內容
+if not is_valid:
+    st.error(WELCOME_INFO_MD)
+    for error in errors:
+        st.warning(error)
+    st.button("🔄 重新載入配置", key="btn_reload_config", on_click=_reload_settings)
+    st.stop()
+
+# ========== GC 設定 ==========
+# 可選（DISABLE_AUTO_GC=true）：每次 rerun 都會重建大量短命物件，自動 GC 會在 rerun 中途觸發；
+# 改為 rerun 結束後統一回收。gc.disable() 影響整個程序（含背景執行緒），因此預設關閉
+if get_settings().disable_auto_gc:
+    gc.disable()
+
+def _collect_garbage():
+    """
+    rerun 結束後手動回收（僅在停用自動 GC 時使用）
+
+    平時只回收第 0、1 代；第 2 代累積次數達到自動 GC 的門檻時做一次完整回收，
+    避免長時間運行的伺服器、背景執行緒與 cache_resource 物件中的循環參照永遠不被釋放
+    """
+    if gc.get_count()[2] >= gc.get_threshold()[2]:
+        gc.collect()
+    else:
+        gc.collect(1)
 
-def reset_idle_timer():
-    """重置 idle 計時器（每次用戶操作時調用）"""
-    global idle_timer
-    # 先把舊的 timer 取消，避免多個 timer 同時存在
-    if idle_timer is not None:
-        idle_timer.cancel()
-    idle_timer = threading.Timer(IDLE_TIMEOUT, _exit_app)
-    idle_timer.daemon = True
-    idle_timer.start()
-
-# 每次 Streamlit rerun（也就是有互動時）都會執行到這裡 → 重新計時
-reset_idle_timer()
-
-# ========== 側邊欄導航樣式優化 ==========
-st.markdown("""
+# ========== 靜態 CSS（側邊欄導航 + 主題切換按鈕）==========
+_STATIC_CSS = """
 <style>
 /* 優化側邊欄導航樣式 */
 [data-testid="stSidebarNav"] {
@@ -87,13 +132,30 @@ st.markdown("""
 [data-testid="stSidebarNav"] a:hover {
     background-color: rgba(128, 128, 128, 0.1);
 }
-</style>
-""", unsafe_allow_html=True)
 
-# ========== 主題切換按鈕（右上角）==========
-# 使用自定義 CSS 實現固定位置的主題切換
-st.markdown("""
-<style>
+/* 首頁策略卡片（兩欄 grid + 原生 details 摺疊） */
+.strat-grid {
+    display: grid;
+    grid-template-columns: repeat(2, 1fr);
+    gap: 0.75rem;
+}
+
+.strat {
+    border: 1px solid rgba(128, 128, 128, 0.3);
+    border-radius: 0.5rem;
+    padding: 0.75rem 1rem;
+}
+
+.strat summary {
+    cursor: pointer;
+    font-weight: 600;
+}
+
+.strat[open] summary {
+    margin-bottom: 0.5rem;
+}
+
+/* 固定位置的主題切換按鈕 */
 .theme-toggle-container {
     position: fixed;
     top: 1rem;
@@ -101,229 +163,128 @@ st.markdown("""
     z-index: 999;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# 創建一個容器來放置主題切換按鈕
-col_left, col_right = st.columns([9, 1])
-with col_right:
+@st.cache_resource
+def _theme_css(theme: str) -> str:
+    """產生主題 CSS + 靜態 CSS（只有 dark / light 兩種，快取後不再重組字串）"""
+    from frontend.theme import Theme  # 延遲導入：快取命中後不再需要
+
+    return Theme.generate_css(theme) + _STATIC_CSS
+
+# ========== 應用主題 CSS（主題 CSS 與靜態 CSS 一次送出）==========
+st.markdown(_theme_css(st.session_state.theme), unsafe_allow_html=True)
+
+# ========== Idle Auto-Exit（Railway Serverless Sleep）==========
+
+IDLE_TIMEOUT = 600  # 10 分鐘無操作自動退出（秒）
+
+def _exit_app():
+    """Idle 超時後退出應用，讓 Railway 進入 Sleep 狀態"""
+    print("⏰ Idle timeout reached. Exiting app so Railway can scale to zero.")
+    os._exit(0)  # 強制結束程式，讓 Railway 把容器關掉
+
+@st.cache_resource
+def _idle_watchdog() -> dict:
+    """
+    啟動唯一的 idle 監看執行緒（整個程序只建立一次）
+
+    Returns:
+        共用狀態字典，rerun 時更新其中的 deadline 即可重新計時
+    """
+    # cache_resource 為程序層級單例：所有 session 共用同一個 deadline，任一使用者互動都會延後退出
+    state = {"deadline": time.monotonic() + IDLE_TIMEOUT}
+
+    def watch():
+        while True:
+            time.sleep(5)
+            if time.monotonic() > state["deadline"]:
+                _exit_app()
+
+    threading.Thread(target=watch, name="idle-watchdog", daemon=True).start()
+    return state
+
+# 每次 Streamlit rerun（也就是有互動時）都會執行到這裡 → 延後 deadline（dict 賦值為原子操作）
+_idle_watchdog()["deadline"] = time.monotonic() + IDLE_TIMEOUT
+
+# ========== 背景預先導入頁面模組 ==========
+
+# 各頁面會用到的較重模組，首次請求後於背景執行緒導入，縮短第一次切換頁面的等待
+_PRELOAD_MODULES = (
+    'pandas',
+    'backend.data_sources.finlab_client',
+    'backend.data_sources.yfinance_client',
+    'backend.data_sources.trading_economics_client',
+    'backend.database.duckdb_client',
+    'backend.strategies.strategy_manager',
+)
+
+@st.cache_resource
+def _preload_modules():
+    """啟動背景執行緒預先導入頁面模組（整個程序只執行一次）"""
+    def preload():
+        for module_name in _PRELOAD_MODULES:
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                # 預載失敗不影響主流程，頁面導入時會再顯示實際錯誤
+                print(f"⚠️  預先導入 {module_name} 失敗: {e}")
+
+    threading.Thread(target=preload, name="module-preload", daemon=True).start()
+
+_preload_modules()
+
+# ========== 主題切換按鈕（右上角）==========
+
+@st.fragment
+def _theme_toggle():
+    """主題切換按鈕（fragment：點擊只重跑此區塊，確定切換後才整頁重跑套用新 CSS）"""
     # 獲取下一個主題的圖標
     next_theme = 'light' if st.session_state.theme == 'dark' else 'dark'
     theme_icon = '☀️' if next_theme == 'light' else '🌙'
 
     if st.button(theme_icon, key="theme_toggle_top", help=f"切換至{'淺色模式' if next_theme == 'light' else '深色模式'}"):
         st.session_state.theme = next_theme
-        st.rerun()
+        st.rerun(scope="app")
+
+# 創建一個容器來放置主題切換按鈕
+col_left, col_right = st.columns([9, 1])
+with col_right:
+    _theme_toggle()
 
 # ========== 側邊欄 ==========
 
 with st.sidebar:
     st.markdown("### 📊 系統狀態")
 
-    # 檢查配置
-    is_valid, errors = settings.validate()
+    # 配置不完整時已在頁面配置後提前結束，執行到這裡表示必要配置齊全
+    st.success("✅ 系統配置完整")
 
-    if is_valid:
-        st.success("✅ 系統配置完整")
-    else:
-        st.error("❌ 系統配置不完整")
-        for error in errors:
-            st.warning(error)
+    st.button("🔄 重新載入配置", key="btn_reload_config", on_click=_reload_settings, width='stretch')
 
     st.markdown("---")
 
     st.markdown("### ⚙️ 系統資訊")
     st.info(f"""
-    **環境**: {settings.app_env}
+    **環境**: {get_settings().app_env}
     **資料庫**: DuckDB
     **Python**: 3.10+
-    **Streamlit**: 1.30+
+    **Streamlit**: 1.37+
     """)
 
-# ========== 主內容 ==========
-
-# 標題
-st.markdown('<h1 class="main-title">📈 KevinRule 台股智能選股系統</h1>', unsafe_allow_html=True)
-st.markdown('<p class="sub-title">基於 FinLab API 的量化選股 + Claude AI 智能分析</p>', unsafe_allow_html=True)
-
-st.markdown("---")
-
-# 歡迎訊息
-if not is_valid:
-    st.error("""
-    ⚠️ **系統配置不完整，請先完成設定！**
-
-    請確認以下步驟：
-    1. 複製 `.env.example` 為 `.env`
-    2. 填入你的 FinLab API Key
-    3. 填入 Claude API Key（選填）
-    4. 重新啟動應用
-
-    詳見 README.md 中的「快速開始」章節。
-    """)
-    st.stop()
+# ========== 頁面導航 ==========
 
-# 功能介紹
-st.markdown("## 🚀 主要功能")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("""
-    <div class="feature-card">
-        <h3>📊 量化選股</h3>
-        <p>6 種專業策略</p>
-        <p>自動選出優質標的</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    if st.button("開始選股 →", key="btn_stock_selection", width='stretch'):
-        st.switch_page("pages/3_🔍_AI選股.py")
-
-with col2:
-    st.markdown("""
-    <div class="feature-card">
-        <h3>📈 持股追蹤</h3>
-        <p>管理 5 檔自選股</p>
-        <p>即時監控表現</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    if st.button("我的持股 →", key="btn_my_stocks", width='stretch'):
-        st.switch_page("pages/2_📊_我的持股.py")
-
-with col3:
-    st.markdown("""
-    <div class="feature-card">
-        <h3>🏠 市場總覽</h3>
-        <p>國際市場動態</p>
-        <p>台股指數監控</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    if st.button("市場總覽 →", key="btn_market", width='stretch'):
-        st.switch_page("pages/1_🏠_市場總覽.py")
-
-st.markdown("---")
-
-# 6 種策略介紹
-st.markdown("## 🎯 6 種選股策略")
-
-strategies = [
-    {
-        "name": "策略 1: 營收動能高於同業平均",
-        "description": "選擇月營收 YoY > 20% 且持續成長的股票",
-        "icon": "📈",
-        "features": ["營收年增率 > 20%", "營收月增率 > 0", "高於產業中位數", "價格 < 150元"]
-    },
-    {
-        "name": "策略 2: 低價小股本營收創一年高",
-        "description": "小型成長股，營收創新高",
-        "icon": "🚀",
-        "features": ["股價 < 100元", "市值 < 100億", "營收創 12 個月新高", "YoY > 15%"]
-    },
-    {
-        "name": "策略 3: 長時間未破底後創新高",
-        "description": "底部穩固後突破（VCP 型態）",
-        "icon": "📊",
-        "features": ["60天未創新低", "創 20 天新高", "波動率收斂", "成交量放大"]
-    },
-    {
-        "name": "策略 4: 連兩日大戶大買超",
-        "description": "主力吸籌訊號",
-        "icon": "💰",
-        "features": ["連續 2 日上漲", "成交量放大 1.5 倍", "融資減少", "漲幅 < 7%"]
-    },
-    {
-        "name": "策略 5: 大現增快繳款結束",
-        "description": "現金增資後資金到位",
-        "icon": "💵",
-        "features": ["股本增加 > 5%", "現金增加 > 20%", "ROE > 10%", "營收成長"]
-    },
-    {
-        "name": "策略 6: 現金快速累積中",
-        "description": "營業現金流強勁的高品質公司",
-        "icon": "💎",
-        "features": ["營業現金流連續為正", "現金連續增加", "自由現金流 > 0", "ROE > 10%"]
-    }
+pages = [
+    st.Page("home.py", title="首頁", icon="📈", default=True),
+    st.Page("pages/1_🏠_市場總覽.py", title="市場總覽", icon="🏠"),
+    st.Page("pages/2_📊_我的持股.py", title="我的持股", icon="📊"),
+    st.Page("pages/3_🔍_AI選股.py", title="AI選股", icon="🔍"),
 ]
 
-col1, col2 = st.columns(2)
-
-for i, strategy in enumerate(strategies):
-    col = col1 if i % 2 == 0 else col2
-
-    with col:
-        with st.expander(f"{strategy['icon']} {strategy['name']}", expanded=False):
-            st.markdown(f"**{strategy['description']}**")
-            st.markdown("**篩選條件：**")
-            for feature in strategy['features']:
-                st.markdown(f"- {feature}")
-
-st.markdown("---")
-
-# 快速開始
-st.markdown("## 🎬 快速開始")
-
-st.info("""
-### 建議使用流程：
-
-1. **📊 查看市場總覽** - 了解當前市場環境
-2. **🔍 執行 AI 選股** - 運行 6 種策略找出候選標的
-3. **📈 加入我的持股** - 將心儀標的加入追蹤清單（最多 5 檔）
-4. **📊 持續監控** - 定期檢視持股表現與新推薦
-
-⚠️ **風險提醒**：
-- 過去績效不代表未來報酬
-- 建議先紙上交易 1-3 個月
-- 設定停損機制（個股 -15%, 組合 -10%）
-- 不要投入超過可承受損失的資金
-""")
-
-st.markdown("---")
-
-# 系統資訊
-st.markdown("## ℹ️ 系統資訊")
-
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.markdown("""
-    <div class="metric-card">
-        <h3>6</h3>
-        <p>選股策略</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown("""
-    <div class="metric-card">
-        <h3>5</h3>
-        <p>持股追蹤</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col3:
-    st.markdown("""
-    <div class="metric-card">
-        <h3>15</h3>
-        <p>分析維度</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col4:
-    st.markdown("""
-    <div class="metric-card">
-        <h3>AI</h3>
-        <p>智能分析</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-st.markdown("---")
-
-# 頁腳
-st.markdown("""
-<div style="text-align: center; color: #666; padding: 2rem 0;">
-    <p>KevinRule © 2024 | 僅供學習研究使用，不構成投資建議</p>
-    <p>Built with ❤️ using Streamlit + FinLab + Claude AI</p>
-</div>
-""", unsafe_allow_html=True)
+current_page = st.navigation(pages)
+try:
+    current_page.run()
+finally:
+    # 頁面內的 st.stop() / st.rerun() 以例外結束，finally 確保每次 rerun 都會回收
+    if get_settings().disable_auto_gc:
+        _collect_garbage()
@@ -0,0 +1,86 @@
+"""
+KevinRule 首頁
+Home Page
+
+由 app.py 的 st.navigation 載入；頁面配置、配置檢查、主題 CSS 與側邊欄已在 app.py 處理
+"""
+
+import streamlit as st
+from frontend.home_content import (
+    STRATEGIES_HTML,
+    QUICKSTART_MD,
+    METRIC_GRID_HTML,
+    FOOTER_HTML,
+)
+
+# ========== 主內容 ==========
+
+# 標題
+st.markdown('<h1 class="main-title">📈 KevinRule 台股智能選股系統</h1>', unsafe_allow_html=True)
+st.markdown('<p class="sub-title">基於 FinLab API 的量化選股 + Claude AI 智能分析</p>', unsafe_allow_html=True)
+
+st.markdown("---")
+
+# 功能介紹
+st.markdown("## 🚀 主要功能")
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.markdown("""
+    <div class="feature-card">
+        <h3>📊 量化選股</h3>
+        <p>6 種專業策略</p>
+        <p>自動選出優質標的</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.page_link("pages/3_🔍_AI選股.py", label="開始選股 →", width='stretch')
+
+with col2:
+    st.markdown("""
+    <div class="feature-card">
+        <h3>📈 持股追蹤</h3>
+        <p>管理 5 檔自選股</p>
+        <p>即時監控表現</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.page_link("pages/2_📊_我的持股.py", label="我的持股 →", width='stretch')
+
+with col3:
+    st.markdown("""
+    <div class="feature-card">
+        <h3>🏠 市場總覽</h3>
+        <p>國際市場動態</p>
+        <p>台股指數監控</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.page_link("pages/1_🏠_市場總覽.py", label="市場總覽 →", width='stretch')
+
+st.markdown("---")
+
+# 6 種策略介紹
+st.markdown("## 🎯 6 種選股策略")
+
+st.markdown(STRATEGIES_HTML, unsafe_allow_html=True)
+
+st.markdown("---")
+
+# 快速開始
+st.markdown("## 🎬 快速開始")
+
+st.info(QUICKSTART_MD)
+
+st.markdown("---")
+
+# 系統資訊
+st.markdown("## ℹ️ 系統資訊")
+
+st.markdown(METRIC_GRID_HTML, unsafe_allow_html=True)
+
+st.markdown("---")
+
+# 頁腳
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
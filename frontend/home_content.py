@@ -0,0 +1,113 @@
+"""
+首頁靜態內容
+Static Content for the Home Page
+
+頁面腳本每次 rerun 都會重新執行，靜態內容放在可導入的模組中，
+只在首次導入時建立一次
+"""
+
+from types import MappingProxyType
+
+# ========== 配置不完整提示（app.py 使用）==========
+
+WELCOME_INFO_MD = """
+    ⚠️ **系統配置不完整，請先完成設定！**
+
+    請確認以下步驟：
+    1. 複製 `.env.example` 為 `.env`
+    2. 填入你的 FinLab API Key
+    3. 填入 Claude API Key（選填）
+    4. 重新啟動應用
+
+    詳見 README.md 中的「快速開始」章節。
+"""
+
+# ========== 6 種策略介紹（唯讀）==========
+
+STRATEGIES = (
+    MappingProxyType({
+        "name": "策略 1: 營收動能高於同業平均",
+        "description": "選擇月營收 YoY > 20% 且持續成長的股票",
+        "icon": "📈",
+        "features": ("營收年增率 > 20%", "營收月增率 > 0", "高於產業中位數", "價格 < 150元")
+    }),
+    MappingProxyType({
+        "name": "策略 2: 低價小股本營收創一年高",
+        "description": "小型成長股，營收創新高",
+        "icon": "🚀",
+        "features": ("股價 < 100元", "市值 < 100億", "營收創 12 個月新高", "YoY > 15%")
+    }),
+    MappingProxyType({
+        "name": "策略 3: 長時間未破底後創新高",
+        "description": "底部穩固後突破（VCP 型態）",
+        "icon": "📊",
+        "features": ("60天未創新低", "創 20 天新高", "波動率收斂", "成交量放大")
+    }),
+    MappingProxyType({
+        "name": "策略 4: 連兩日大戶大買超",
+        "description": "主力吸籌訊號",
+        "icon": "💰",
+        "features": ("連續 2 日上漲", "成交量放大 1.5 倍", "融資減少", "漲幅 < 7%")
+    }),
+    MappingProxyType({
+        "name": "策略 5: 大現增快繳款結束",
+        "description": "現金增資後資金到位",
+        "icon": "💵",
+        "features": ("股本增加 > 5%", "現金增加 > 20%", "ROE > 10%", "營收成長")
+    }),
+    MappingProxyType({
+        "name": "策略 6: 現金快速累積中",
+        "description": "營業現金流強勁的高品質公司",
+        "icon": "💎",
+        "features": ("營業現金流連續為正", "現金連續增加", "自由現金流 > 0", "ROE > 10%")
+    })
+)
+
+# 策略卡片（原生 <details> 摺疊，不需 st.expander 元件；樣式見 app.py 的 _STATIC_CSS）
+STRATEGIES_HTML = (
+    '<div class="strat-grid">'
+    + ''.join(
+        f'<details class="strat"><summary>{strategy["icon"]} {strategy["name"]}</summary>'
+        f'<p><b>{strategy["description"]}</b></p><p><b>篩選條件：</b></p><ul>'
+        + ''.join(f'<li>{feature}</li>' for feature in strategy["features"])
+        + '</ul></details>'
+        for strategy in STRATEGIES
+    )
+    + '</div>'
+)
+
+# ========== 快速開始 ==========
+
+QUICKSTART_MD = """
+### 建議使用流程：
+
+1. **📊 查看市場總覽** - 了解當前市場環境
+2. **🔍 執行 AI 選股** - 運行 6 種策略找出候選標的
+3. **📈 加入我的持股** - 將心儀標的加入追蹤清單（最多 5 檔）
+4. **📊 持續監控** - 定期檢視持股表現與新推薦
+
+⚠️ **風險提醒**：
+- 過去績效不代表未來報酬
+- 建議先紙上交易 1-3 個月
+- 設定停損機制（個股 -15%, 組合 -10%）
+- 不要投入超過可承受損失的資金
+"""
+
+# ========== 系統資訊 ==========
+
+# 系統資訊卡片（以單一 grid 一次送出）
+_METRIC_CARDS = (("6", "選股策略"), ("5", "持股追蹤"), ("15", "分析維度"), ("AI", "智能分析"))
+METRIC_GRID_HTML = (
+    '<div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem;">'
+    + ''.join(f'<div class="metric-card"><h3>{value}</h3><p>{label}</p></div>' for value, label in _METRIC_CARDS)
+    + '</div>'
+)
+
+# ========== 頁腳 ==========
+
+FOOTER_HTML = """
+<div style="text-align: center; color: #666; padding: 2rem 0;">
+    <p>KevinRule © 2024 | 僅供學習研究使用，不構成投資建議</p>
+    <p>Built with ❤️ using Streamlit + FinLab + Claude AI</p>
+</div>
+"""
@@ -5,59 +5,21 @@
 
 import streamlit as st
 import pandas as pd
-import sys
-from pathlib import Path
+import numpy as np
+import os
+import time
+import pickle
+import html
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
-# 添加專案根目錄到路徑
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
+# 專案根目錄已由 frontend/app.py（st.navigation 路由）加入 sys.path
 from backend.data_sources.yfinance_client import YFinanceClient
 from backend.data_sources.trading_economics_client import TradingEconomicsClient
 from backend.data_sources.finlab_client import FinLabClient
-from frontend.theme import Theme
-
-# ========== 頁面配置 ==========
-
-st.set_page_config(
-    page_title="市場總覽 - KevinRule",
-    page_icon="🏠",
-    layout="wide"
-)
-
-# ========== 主題初始化 ==========
-if 'theme' not in st.session_state:
-    st.session_state.theme = 'dark'  # 預設深色主題
-
-# ========== 應用主題 CSS ==========
-st.markdown(Theme.generate_css(st.session_state.theme), unsafe_allow_html=True)
-
-# ========== 側邊欄導航樣式優化 ==========
-st.markdown("""
-<style>
-/* 優化側邊欄導航樣式 */
-[data-testid="stSidebarNav"] {
-    padding-top: 1rem;
-}
-
-/* 優化導航連結樣式 */
-[data-testid="stSidebarNav"] ul {
-    padding: 0;
-}
-
-[data-testid="stSidebarNav"] a {
-    padding: 0.75rem 1rem;
-    border-radius: 0.5rem;
-    margin-bottom: 0.25rem;
-    transition: background-color 0.2s;
-}
-
-[data-testid="stSidebarNav"] a:hover {
-    background-color: rgba(128, 128, 128, 0.1);
-}
-</style>
-""", unsafe_allow_html=True)
+from config.settings import get_settings
 
 # ========== 頁面標題 ==========
 
@@ -65,40 +27,117 @@ st.title("🏠 市場總覽")
 st.markdown("掌握國際市場動態與台股關鍵指標")
 st.markdown("---")
 
+# ========== 客戶端（程序內共用，登入/連線設定只做一次）==========
+
+@st.cache_resource
+def get_yf_client() -> YFinanceClient:
+    """Yahoo Finance 客戶端"""
+    return YFinanceClient()
+
+@st.cache_resource
+def get_finlab_client() -> FinLabClient:
+    """FinLab 客戶端（建構時會確保 FinLab 已登入）"""
+    return FinLabClient()
+
+@st.cache_resource
+def get_te_client() -> TradingEconomicsClient:
+    """Trading Economics 客戶端"""
+    return TradingEconomicsClient()
+
 # ========== 數據載入函數 ==========
 
-@st.cache_data(ttl=300)  # 快取5分鐘
+@st.cache_resource
+def get_io_pool() -> ThreadPoolExecutor:
+    """網路 I/O 共用執行緒池（跨 rerun 重用執行緒）"""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="market-io")
+
+def fetch_concurrently(fetchers: dict) -> dict:
+    """
+    並行執行多個互不相依的網路請求
+
+    Args:
+        fetchers: {key: (fetch_fn, fallback)}，fetch_fn 失敗時以 fallback 取代
+
+    Returns:
+        {key: 結果}
+    """
+    pool = get_io_pool()
+    futures = {key: pool.submit(fetch_fn) for key, (fetch_fn, _) in fetchers.items()}
+
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            # 單一來源失敗不影響其他數據
+            print(f"⚠️  載入 {key} 失敗: {e}")
+            results[key] = fetchers[key][1]
+    return results
+
+# 以下載入函數的回傳值在頁面中只讀不改，使用 st.cache_resource 以參照共用，命中時不需反序列化複本
+
+@st.cache_resource(ttl=300)  # 快取5分鐘
 def load_international_data():
     """載入國際市場數據"""
     try:
-        client = YFinanceClient()
+        client = get_yf_client()
         return client.get_all_market_data()
     except Exception as e:
         st.error(f"載入國際市場數據失敗: {e}")
         return None
 
-@st.cache_data(ttl=300)  # 快取5分鐘
-def load_taiwan_market_data():
-    """載入台股市場數據"""
-    try:
-        yf_client = YFinanceClient()
-        finlab_client = FinLabClient()
+# FinLab 各數據集分別快取，更新頻率不同的數據互不影響（秒）
+# 原始 DataFrame 體積大，同樣使用 st.cache_resource 以參照共用（呼叫端只讀不改）
+FINLAB_PRICE_TTL = 300         # 收盤價 / 成交量：日頻數據（每個交易日盤後更新），每次重抓仍下載完整歷史，不宜過於頻繁
+FINLAB_DAILY_TTL = 3600        # 融資融券 / 三大法人：每日盤後才更新
 
-        # 獲取台股指數（Yahoo Finance）
-        tw_indices = yf_client.get_taiwan_indices()
+@st.cache_resource(ttl=FINLAB_PRICE_TTL, show_spinner=False)
+def _cached_close() -> pd.DataFrame:
+    """FinLab 收盤價（只保留最近兩期）"""
+    return get_finlab_client().get_close_tail(2)
 
-        # 獲取匯率
-        usdtwd = yf_client.get_forex('USDTWD')
+@st.cache_resource(ttl=FINLAB_PRICE_TTL, show_spinner=False)
+def _cached_volume() -> pd.DataFrame:
+    """FinLab 成交量（只保留最近兩期）"""
+    return get_finlab_client().get_volume_tail(2)
 
-        # 獲取 FinLab 價格數據（用於計算市場統計）
-        close_df = finlab_client.get_close()
-        volume_df = finlab_client.get_volume()
+@st.cache_resource(ttl=FINLAB_DAILY_TTL, show_spinner=False)
+def _cached_margin() -> dict:
+    """FinLab 融資 / 融券餘額（只保留最近兩期）"""
+    return get_finlab_client().get_margin_data_tail(2)
 
-        # 獲取融資融券數據
-        margin_data = finlab_client.get_margin_data()
+@st.cache_resource(ttl=FINLAB_DAILY_TTL, show_spinner=False)
+def _cached_institutional() -> dict:
+    """FinLab 三大法人買賣超股數（只保留最近兩期）"""
+    return get_finlab_client().get_institutional_investors_trading_tail(2)
 
-        # 獲取三大法人買賣超數據
-        institutional_data = finlab_client.get_institutional_investors_trading()
+@st.cache_resource(ttl=300)  # 快取5分鐘；FinLab 原始數據由上方各自的快取決定是否重抓
+def load_taiwan_market_data():
+    """載入台股市場數據"""
+    try:
+        yf_client = get_yf_client()
+
+        # 各數據來源互不相依，並行請求（總耗時約為最慢的一個）
+        fetched = fetch_concurrently({
+            # 台股指數（Yahoo Finance）
+            'tw_indices': (yf_client.get_taiwan_indices, {}),
+            # 匯率
+            'usdtwd': (lambda: yf_client.get_forex('USDTWD'), None),
+            # FinLab 價格數據（用於計算市場統計）
+            'close': (_cached_close, pd.DataFrame()),
+            'volume': (_cached_volume, pd.DataFrame()),
+            # 融資融券數據
+            'margin': (_cached_margin, {}),
+            # 三大法人買賣超數據
+            'institutional': (_cached_institutional, {}),
+        })
+
+        tw_indices = fetched['tw_indices']
+        usdtwd = fetched['usdtwd']
+        close_df = fetched['close']
+        volume_df = fetched['volume']
+        margin_data = fetched['margin']
+        institutional_data = fetched['institutional']
 
         # 計算市場統計
         market_stats = {}
@@ -106,20 +145,19 @@ def load_taiwan_market_data():
             latest_date = close_df.index[-1]
             prev_date = close_df.index[-2]
 
-            latest_prices = close_df.iloc[-1]
-            prev_prices = close_df.iloc[-2]
+            # 直接取最後兩列的 ndarray，避免 iloc 建立帶 index 的 Series
+            close_arr = close_df.to_numpy(dtype=float)
 
-            # 計算漲跌家數
-            price_changes = latest_prices - prev_prices
-            up_stocks = (price_changes > 0).sum()
-            down_stocks = (price_changes < 0).sum()
-            flat_stocks = (price_changes == 0).sum()
-            total_stocks = len(latest_prices.dropna())
+            # 計算漲跌家數（np.sign 映射為 0/1/2 後一次 bincount 完成三種計數）
+            price_changes = np.subtract(close_arr[-1], close_arr[-2])
+            valid_changes = price_changes[~np.isnan(price_changes)]
+            sign_codes = np.sign(valid_changes).astype(np.int8) + 1
+            down_stocks, flat_stocks, up_stocks = np.bincount(sign_codes, minlength=3)
+            total_stocks = len(valid_changes)
 
             # 計算成交量統計
             if not volume_df.empty:
-                latest_volume = volume_df.iloc[-1]
-                total_volume = latest_volume.sum() / 1000  # 轉換為張數
+                total_volume = np.nansum(volume_df.to_numpy(dtype=float)[-1]) / 1000  # 轉換為張數
 
                 market_stats = {
                     'up_stocks': int(up_stocks),
@@ -132,45 +170,31 @@ def load_taiwan_market_data():
                     'total_volume': float(total_volume) if not pd.isna(total_volume) else 0,
                 }
 
-        # 整合融資融券數據
+        # 整合融資融券數據（融資餘額 / 融券餘額）
         margin_stats = {}
         if margin_data:
-            # 融資餘額
-            if 'margin_balance' in margin_data and not margin_data['margin_balance'].empty:
-                mb = margin_data['margin_balance'].iloc[-1]
-                mb_prev = margin_data['margin_balance'].iloc[-2] if len(margin_data['margin_balance']) > 1 else mb
-                margin_stats['margin_balance'] = float(mb.sum())
-                margin_stats['margin_balance_change'] = float(mb.sum() - mb_prev.sum())
-                margin_stats['margin_balance_change_pct'] = (margin_stats['margin_balance_change'] / mb_prev.sum() * 100) if mb_prev.sum() > 0 else 0
-
-            # 融券餘額
-            if 'short_balance' in margin_data and not margin_data['short_balance'].empty:
-                sb = margin_data['short_balance'].iloc[-1]
-                sb_prev = margin_data['short_balance'].iloc[-2] if len(margin_data['short_balance']) > 1 else sb
-                margin_stats['short_balance'] = float(sb.sum())
-                margin_stats['short_balance_change'] = float(sb.sum() - sb_prev.sum())
-                margin_stats['short_balance_change_pct'] = (margin_stats['short_balance_change'] / sb_prev.sum() * 100) if sb_prev.sum() > 0 else 0
-
-        # 整合三大法人買賣超數據
+            for key in ('margin_balance', 'short_balance'):
+                df = margin_data.get(key)
+                if df is None or df.empty:
+                    continue
+                values = df.to_numpy(dtype=float)
+                latest_sum = float(np.nansum(values[-1]))
+                prev_sum = float(np.nansum(values[-2])) if len(values) > 1 else latest_sum
+                change = latest_sum - prev_sum
+                margin_stats[key] = latest_sum
+                margin_stats[f'{key}_change'] = change
+                margin_stats[f'{key}_change_pct'] = (change / prev_sum * 100) if prev_sum > 0 else 0
+
+        # 整合三大法人買賣超數據（外資 / 投信 / 自營商，轉換為張數：股數 / 1000）
         institutional_stats = {}
         if institutional_data:
-            # 外資買賣超（轉換為張數：股數 / 1000）
-            if 'foreign_net' in institutional_data and not institutional_data['foreign_net'].empty:
-                fn = institutional_data['foreign_net'].iloc[-1]
-                institutional_stats['foreign_net_shares'] = float(fn.sum())
-                institutional_stats['foreign_net_lots'] = institutional_stats['foreign_net_shares'] / 1000  # 轉換為張
-
-            # 投信買賣超
-            if 'investment_trust_net' in institutional_data and not institutional_data['investment_trust_net'].empty:
-                itn = institutional_data['investment_trust_net'].iloc[-1]
-                institutional_stats['investment_trust_net_shares'] = float(itn.sum())
-                institutional_stats['investment_trust_net_lots'] = institutional_stats['investment_trust_net_shares'] / 1000
-
-            # 自營商買賣超
-            if 'dealer_net' in institutional_data and not institutional_data['dealer_net'].empty:
-                dn = institutional_data['dealer_net'].iloc[-1]
-                institutional_stats['dealer_net_shares'] = float(dn.sum())
-                institutional_stats['dealer_net_lots'] = institutional_stats['dealer_net_shares'] / 1000
+            for key in ('foreign_net', 'investment_trust_net', 'dealer_net'):
+                df = institutional_data.get(key)
+                if df is None or df.empty:
+                    continue
+                net_shares = float(np.nansum(df.to_numpy(dtype=float)[-1]))
+                institutional_stats[f'{key}_shares'] = net_shares
+                institutional_stats[f'{key}_lots'] = net_shares / 1000
 
         return {
             'tw_indices': tw_indices,
@@ -178,7 +202,7 @@ def load_taiwan_market_data():
             'market_stats': market_stats,
             'margin_stats': margin_stats,
             'institutional_stats': institutional_stats,
-            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')
         }
 
     except Exception as e:
@@ -187,11 +211,23 @@ def load_taiwan_market_data():
         traceback.print_exc()
         return None
 
-@st.cache_data(ttl=1800)  # 快取30分鐘（經濟日曆變化較慢）
+ECONOMIC_CALENDAR_TTL = 1800  # 經濟日曆變化較慢，快取30分鐘（秒）
+
+@st.cache_resource(ttl=ECONOMIC_CALENDAR_TTL)
 def load_economic_calendar():
-    """載入經濟日曆數據"""
+    """載入經濟日曆數據（行程內 st.cache_resource + 磁碟快取，重啟後不需重新請求 API）"""
     try:
-        client = TradingEconomicsClient()
+        # 磁碟快取仍在有效期內則直接使用（不需建立客戶端）
+        cache_path = get_settings().project_root / 'data' / 'cache' / 'economic_calendar.pkl'
+        if cache_path.exists() and time.time() - cache_path.stat().st_mtime < ECONOMIC_CALENDAR_TTL:
+            try:
+                with open(cache_path, 'rb') as f:
+                    return pickle.load(f)
+            except Exception as e:
+                print(f"⚠️  讀取經濟日曆快取失敗，改為重新請求: {e}")
+
+        # 未設定 API Key 時客戶端會改用 Investing.com 爬蟲，不能只看環境變數就判定停用
+        client = get_te_client()
 
         if not client.enabled:
             return None
@@ -203,11 +239,32 @@ def load_economic_calendar():
             importance_filter=1  # 顯示所有重要性事件
         )
 
-        return {
+        # 事件時間只在載入時解析一次，隨快取保存（渲染時直接比較 datetime）
+        for date_str, events in events_by_date.items():
+            for event in events:
+                try:
+                    event['_dt'] = datetime.strptime(f"{date_str} {event.get('時間', '00:00')}", '%Y-%m-%d %H:%M')
+                except (ValueError, TypeError):
+                    event['_dt'] = None
+
+        calendar_data = {
             'events_by_date': events_by_date,
-            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            # 過濾前的總天數 / 事件數隨快取保存，渲染時不需重新計算
+            'total_days': len(events_by_date),
+            'total_events': sum(len(events) for events in events_by_date.values()),
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')
         }
 
+        # 先寫入暫存檔再 os.replace，避免其他程序讀到寫一半的檔案
+        if events_by_date:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(calendar_data, f)
+            os.replace(tmp_path, cache_path)
+
+        return calendar_data
+
     except Exception as e:
         st.error(f"載入經濟日曆數據失敗: {e}")
         import traceback
@@ -217,20 +274,226 @@ def load_economic_calendar():
 
 # ========== 更新時間 ==========
 
-update_time = datetime.now()
+update_time = datetime.now()  # 本次渲染的時間基準（頁面內共用，快取載入函數另取各自的時間）
 st.info(f"📅 更新時間: {update_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
 # ========== Tab 切換 ==========
 
-tabs = st.tabs([
-    "🌍 國際市場",
-    "🇹🇼 台灣市場",
-    "📅 經濟日曆"
-])
+# st.tabs 會執行所有分頁內容（三個載入函數都會觸發）；改用單選切換，只執行並載入目前選取的分頁
+TAB_LABELS = ["🌍 國際市場", "🇹🇼 台灣市場", "📅 經濟日曆"]
+
+active_tab = st.radio(
+    "分頁",
+    TAB_LABELS,
+    horizontal=True,
+    key="market_overview_tab",
+    label_visibility="collapsed"
+)
+
+# ========== 顯示輔助函數 ==========
+
+def render_quote_metric(quote: dict, label: str, delta_color: str = "normal", prefix: str = ""):
+    """
+    以 st.metric 顯示單一報價（無數據時顯示 N/A）
+
+    Args:
+        quote: 報價字典（price / change / change_percent），可為空
+        label: 指標名稱
+        delta_color: st.metric 漲跌顏色（normal / inverse）
+        prefix: 價格前綴（例如加密貨幣的 $）
+    """
+    if quote:
+        st.metric(
+            label,
+            f"{prefix}{quote['price']:,.2f}",
+            f"{prefix}{quote['change']:+,.2f} ({quote['change_percent']:+.2f}%)",
+            delta_color=delta_color
+        )
+    else:
+        st.metric(label, "N/A", "無數據")
+
+def render_quote_row(columns, rows):
+    """
+    依設定列表逐欄顯示報價
+
+    Args:
+        columns: st.columns 回傳的欄位（數量可多於 rows，剩餘欄位由呼叫端使用）
+        rows: [(報價字典, 名稱, delta_color, prefix), ...]
+    """
+    for col, (quote, label, delta_color, prefix) in zip(columns, rows):
+        with col:
+            render_quote_metric(quote, label, delta_color, prefix)
+
+# 三大法人卡片（外資 / 投信 / 自營商）
+INSTITUTIONAL_CARDS = (
+    ('foreign_net', '外資'),
+    ('investment_trust_net', '投信'),
+    ('dealer_net', '自營商'),
+)
+INSTITUTIONAL_CARD_TPL = (
+    '<div class="market-card"><h4>{title}</h4>'
+    '<p class="{color}" style="font-size: 1.5rem;">{lots:+,.0f} 張</p>'
+    '<p>{label}</p></div>'
+)
+INSTITUTIONAL_GRID_TPL = '<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;">{cards}</div>'
+
+# 經濟日曆顯示設定
+
+# 新聞來源連結標籤
+NEWS_LINK_LABELS = {'google_news': '🔍GN', 'cnyes': '📰鉅亨', 'ctee': '📰工商'}
+
+@lru_cache(maxsize=1024)
+def news_links_html(event_name_raw: str, country: str) -> str:
+    """
+    產生事件的新聞搜尋連結 HTML（只依事件名稱與國家而定，切換篩選時直接重用）
+
+    Args:
+        event_name_raw: 事件原始名稱
+        country: 國家
+
+    Returns:
+        連結 HTML 字串
+    """
+    news_links = TradingEconomicsClient.generate_news_links(
+        {'event_name_raw': event_name_raw, 'country': country}
+    )
+    link_parts = []
+    for source, url in news_links.items():
+        label = NEWS_LINK_LABELS.get(source)
+        if label:
+            link_parts.append(f'<a href="{html.escape(url)}" target="_blank">{label}</a>')
+    return " ".join(link_parts)
+
+# 事件行版面（對應原本的 st.columns([1, 5, 1, 1.5, 1.5, 2])）
+EVENT_ROW_STYLE = "display: grid; grid-template-columns: 1fr 5fr 1fr 1.5fr 1.5fr 2fr; gap: 0.5rem; align-items: center;"
+EVENT_CAPTION_STYLE = "font-size: 0.85em; opacity: 0.75;"
+
+# 事件行 HTML 樣板（固定的樣式於載入時即填入，渲染時只替換動態欄位）
+EVENT_ROW_TPL = (
+    f'<div class="{{css_class}}" style="{EVENT_ROW_STYLE}">'
+    f'<span style="{EVENT_CAPTION_STYLE}">{{time}}</span>'
+    '<span>{event}</span>'
+    f'<span style="{EVENT_CAPTION_STYLE}">{{stars}}</span>'
+    f'<span style="{EVENT_CAPTION_STYLE}">預: {{forecast}}</span>'
+    f'<span style="{EVENT_CAPTION_STYLE}">前: {{previous}}</span>'
+    '<span>{links}</span>'
+    '</div>'
+)
+
+# 依重要性（低 / 中 / 高）對應的 CSS class 與事件名稱樣板
+EVENT_IMPORTANCE_STYLES = (
+    ("event-low-importance", "<span style='opacity: 0.7'>{}</span>"),
+    ("event-medium-importance", "{}"),
+    ("event-high-importance", "<b>{}</b> 🔴"),
+)
+
+@st.cache_data(ttl=ECONOMIC_CALENDAR_TTL, max_entries=32, show_spinner=False)
+def build_calendar_rows(updated_at: str, _events_by_date: dict, allowed_mask: int, today: str) -> list:
+    """
+    組出經濟日曆各事件行的 HTML（結果只由數據版本、重要性篩選與日期決定，切換分頁或其他互動時直接重用）
+
+    已過事件的篩選與時間基準有關，由 render_calendar_html 在快取外處理，快取鍵不含時間。
+
+    Args:
+        updated_at: 經濟日曆數據的更新時間（作為數據版本的快取鍵；_events_by_date 不參與雜湊）
+        _events_by_date: 按日期分組的經濟事件
+        allowed_mask: 重要性篩選位元遮罩（第 1~3 位元對應低/中/高）
+        today: 今天的日期（ISO 格式，用於標示「今天」）
+
+    Returns:
+        依日期與時間排序的 [(日期顯示字串, 事件時間或 None, 事件行 HTML)]
+    """
+    table_data = []
+
+    for date_str, events in _events_by_date.items():
+        # 格式化日期顯示（同一天的事件共用）
+        try:
+            weekday = datetime.strptime(date_str, '%Y-%m-%d').strftime('%a')
+            if date_str == today:
+                date_display = f"📅 今天 ({weekday})"
+            else:
+                date_display = f"{date_str} ({weekday})"
+        except ValueError:
+            date_display = date_str
+
+        for event in events:
+            importance_level = int(event.get('importance_level', 1))
+
+            # 應用重要性篩選
+            if not (allowed_mask >> importance_level) & 1:
+                continue
+
+            # 生成新聞連結 HTML（優先使用 Investing.com 事件連結）
+            event_url = event.get('event_url', '')
+
+            if event_url:
+                # 如果有 Investing.com 事件連結，優先使用
+                links_display = f'<a href="{html.escape(event_url)}" target="_blank">🔍詳情</a>'
+            else:
+                # 回退到 Google 新聞搜尋
+                links_display = news_links_html(event.get('event_name_raw', ''), event.get('country', ''))
+
+            # 組表時即決定樣式，渲染迴圈不再分支
+            css_class, event_tpl = EVENT_IMPORTANCE_STYLES[min(max(importance_level, 1), 3) - 1]
+
+            # 事件時間已於 load_economic_calendar 預先解析
+            event_datetime = event.get('_dt')
+            row_html = EVENT_ROW_TPL.format(
+                css_class=css_class,
+                time=html.escape(str(event.get('時間', '-'))),
+                event=event_tpl.format(html.escape(str(event.get('事件', 'N/A')))),
+                stars=event.get('重要性', '⭐'),
+                forecast=html.escape(str(event.get('預期', '-'))),
+                previous=html.escape(str(event.get('前值', '-'))),
+                links=links_display,
+            )
+
+            # 排序用（ISO 日期 + 預先解析的時間，無法解析的時間排在當天最前）
+            table_data.append(((date_str, event_datetime or datetime.min), date_display, event_datetime, row_html))
+
+    # 按日期和時間排序（不可用顯示字串排序：「📅 今天」會排到所有日期之後）
+    table_data.sort(key=itemgetter(0))
+
+    return [row[1:] for row in table_data]
+
+def render_calendar_html(rows: list, show_past: bool, now: datetime) -> tuple:
+    """
+    套用已過事件篩選並組出時間軸 HTML（每次 rerun 執行，只做字串拼接）
+
+    Args:
+        rows: build_calendar_rows 的結果
+        show_past: 是否顯示已過事件
+        now: 判斷事件是否已過的時間基準
+
+    Returns:
+        (時間軸 HTML, 篩選後天數, 篩選後事件數)
+    """
+    # 分組顯示（按日期）：整個時間軸組成單一 HTML
+    html_parts = []
+    current_date = None
+    days = 0
+    event_count = 0
+    for date_display, event_datetime, row_html in rows:
+        if not show_past and event_datetime is not None and event_datetime < now:
+            continue
+
+        # 日期標題（sticky header風格）
+        if date_display != current_date:
+            current_date = date_display
+            days += 1
+            if "今天" in date_display:
+                html_parts.append(f'<div class="economic-calendar-today"><h4 style="margin: 0;">🌟 {date_display}</h4></div>')
+            else:
+                html_parts.append(f'<div class="economic-calendar-date"><h4 style="margin: 0;">📅 {date_display}</h4></div>')
+
+        html_parts.append(row_html)
+        event_count += 1
+
+    return "".join(html_parts), days, event_count
 
 # ========== Tab 1: 國際市場 ==========
 
-with tabs[0]:
+if active_tab == TAB_LABELS[0]:
     st.header("🌍 國際市場參考")
 
     # 載入數據
@@ -248,92 +511,22 @@ with tabs[0]:
         # 主要美股指數
         st.subheader("📊 美股三大指數")
 
-        col1, col2, col3 = st.columns(3)
-
-        # 道瓊工業指數
-        with col1:
-            dji = us_indices.get('DJI', {})
-            if dji:
-                st.metric(
-                    "道瓊工業指數",
-                    f"{dji['price']:,.2f}",
-                    f"{dji['change']:+,.2f} ({dji['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("道瓊工業指數", "N/A", "無數據")
-
-        # S&P 500
-        with col2:
-            sp500 = us_indices.get('SP500', {})
-            if sp500:
-                st.metric(
-                    "S&P 500",
-                    f"{sp500['price']:,.2f}",
-                    f"{sp500['change']:+,.2f} ({sp500['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("S&P 500", "N/A", "無數據")
-
-        # 那斯達克
-        with col3:
-            nasdaq = us_indices.get('NASDAQ', {})
-            if nasdaq:
-                st.metric(
-                    "那斯達克",
-                    f"{nasdaq['price']:,.2f}",
-                    f"{nasdaq['change']:+,.2f} ({nasdaq['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("那斯達克", "N/A", "無數據")
+        render_quote_row(st.columns(3), [
+            (us_indices.get('DJI'), "道瓊工業指數", "normal", ""),
+            (us_indices.get('SP500'), "S&P 500", "normal", ""),
+            (us_indices.get('NASDAQ'), "那斯達克", "normal", ""),
+        ])
 
         st.markdown("---")
 
         # 費半與VIX
         st.subheader("📈 關鍵指標")
 
-        col1, col2, col3 = st.columns(3)
-
-        # 費城半導體指數
-        with col1:
-            sox = us_indices.get('SOX', {})
-            if sox:
-                st.metric(
-                    "費城半導體指數",
-                    f"{sox['price']:,.2f}",
-                    f"{sox['change']:+,.2f} ({sox['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("費城半導體指數", "N/A", "無數據")
-
-        # VIX 恐慌指數
-        with col2:
-            vix = us_indices.get('VIX', {})
-            if vix:
-                st.metric(
-                    "VIX 恐慌指數",
-                    f"{vix['price']:,.2f}",
-                    f"{vix['change']:+,.2f} ({vix['change_percent']:+.2f}%)",
-                    delta_color="inverse"  # VIX 下跌是好事
-                )
-            else:
-                st.metric("VIX 恐慌指數", "N/A", "無數據")
-
-        # 美元指數
-        with col3:
-            dxy = us_indices.get('DXY', {})
-            if dxy:
-                st.metric(
-                    "美元指數",
-                    f"{dxy['price']:,.2f}",
-                    f"{dxy['change']:+,.2f} ({dxy['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("美元指數", "N/A", "無數據")
+        render_quote_row(st.columns(3), [
+            (us_indices.get('SOX'), "費城半導體指數", "normal", ""),
+            (us_indices.get('VIX'), "VIX 恐慌指數", "inverse", ""),  # VIX 下跌是好事
+            (us_indices.get('DXY'), "美元指數", "normal", ""),
+        ])
 
         st.markdown("---")
 
@@ -341,32 +534,10 @@ with tabs[0]:
         st.subheader("₿ 加密貨幣")
 
         col1, col2, col3 = st.columns(3)
-
-        # 比特幣
-        with col1:
-            btc = crypto.get('BTC', {})
-            if btc:
-                st.metric(
-                    "比特幣 (BTC)",
-                    f"${btc['price']:,.2f}",
-                    f"${btc['change']:+,.2f} ({btc['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("比特幣 (BTC)", "N/A", "無數據")
-
-        # 以太坊
-        with col2:
-            eth = crypto.get('ETH', {})
-            if eth:
-                st.metric(
-                    "以太坊 (ETH)",
-                    f"${eth['price']:,.2f}",
-                    f"${eth['change']:+,.2f} ({eth['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("以太坊 (ETH)", "N/A", "無數據")
+        render_quote_row((col1, col2), [
+            (crypto.get('BTC'), "比特幣 (BTC)", "normal", "$"),
+            (crypto.get('ETH'), "以太坊 (ETH)", "normal", "$"),
+        ])
 
         # 市場情緒（保留為參考數據）
         with col3:
@@ -381,8 +552,8 @@ with tabs[0]:
         # 亞洲市場
         st.subheader("🌏 亞洲市場")
 
-        # 建立亞洲市場數據表格
-        asia_data = []
+        # 建立亞洲市場數據表格（逐欄收集）
+        asia_labels, asia_prices, asia_changes, asia_statuses = [], [], [], []
 
         market_labels = {
             'N225': '日經225',
@@ -395,19 +566,20 @@ with tabs[0]:
         for key, label in market_labels.items():
             market = asia_markets.get(key, {})
             if market:
-                change_display = f"{market['change']:+,.2f} ({market['change_percent']:+.2f}%)"
-                status = '上漲' if market['change'] > 0 else '下跌' if market['change'] < 0 else '持平'
-                asia_data.append({
-                    '市場': label,
-                    '指數': f"{market['price']:,.2f}",
-                    '漲跌': change_display,
-                    '狀態': status
-                })
-
-        if asia_data:
-            asia_df = pd.DataFrame(asia_data)
+                asia_labels.append(label)
+                asia_prices.append(f"{market['price']:,.2f}")
+                asia_changes.append(f"{market['change']:+,.2f} ({market['change_percent']:+.2f}%)")
+                asia_statuses.append('上漲' if market['change'] > 0 else '下跌' if market['change'] < 0 else '持平')
+
+        if asia_labels:
+            # st.dataframe 可直接接受欄位字典，不需先建立 DataFrame
             st.dataframe(
-                asia_df,
+                {
+                    '市場': asia_labels,
+                    '指數': asia_prices,
+                    '漲跌': asia_changes,
+                    '狀態': asia_statuses
+                },
                 width='stretch',
                 hide_index=True
             )
@@ -424,7 +596,7 @@ with tabs[0]:
 
 # ========== Tab 2: 台灣市場 ==========
 
-with tabs[1]:
+elif active_tab == TAB_LABELS[1]:
     st.header("🇹🇼 台灣股市")
 
     # 載入數據
@@ -444,45 +616,11 @@ with tabs[1]:
         st.subheader("📊 大盤指數")
 
         col1, col2, col3, col4 = st.columns(4)
-
-        # 加權指數
-        with col1:
-            twii = tw_indices.get('TWII', {})
-            if twii:
-                st.metric(
-                    "加權指數",
-                    f"{twii['price']:,.2f}",
-                    f"{twii['change']:+,.2f} ({twii['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("加權指數", "N/A", "無數據")
-
-        # 櫃買指數
-        with col2:
-            two = tw_indices.get('TWO', {})
-            if two:
-                st.metric(
-                    "櫃買指數",
-                    f"{two['price']:,.2f}",
-                    f"{two['change']:+,.2f} ({two['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("櫃買指數", "N/A", "無數據")
-
-        # 台灣50
-        with col3:
-            tw50 = tw_indices.get('0050.TW', {})
-            if tw50:
-                st.metric(
-                    "台灣50",
-                    f"{tw50['price']:,.2f}",
-                    f"{tw50['change']:+,.2f} ({tw50['change_percent']:+.2f}%)",
-                    delta_color="normal"
-                )
-            else:
-                st.metric("台灣50", "N/A", "無數據")
+        render_quote_row((col1, col2, col3), [
+            (tw_indices.get('TWII'), "加權指數", "normal", ""),
+            (tw_indices.get('TWO'), "櫃買指數", "normal", ""),
+            (tw_indices.get('0050.TW'), "台灣50", "normal", ""),
+        ])
 
         # 電子指數（暫無數據源）
         with col4:
@@ -498,46 +636,13 @@ with tabs[1]:
         st.subheader("💼 籌碼分析")
 
         if institutional_stats:
-            col1, col2, col3 = st.columns(3)
-
-            # 外資買賣超
-            with col1:
-                foreign_lots = institutional_stats.get('foreign_net_lots', 0)
-                foreign_color = "positive" if foreign_lots > 0 else "negative" if foreign_lots < 0 else ""
-
-                st.markdown(f"""
-                <div class="market-card">
-                    <h4>外資</h4>
-                    <p class="{foreign_color}" style="font-size: 1.5rem;">{foreign_lots:+,.0f} 張</p>
-                    <p>{'買超' if foreign_lots > 0 else '賣超' if foreign_lots < 0 else '持平'}</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            # 投信買賣超
-            with col2:
-                it_lots = institutional_stats.get('investment_trust_net_lots', 0)
-                it_color = "positive" if it_lots > 0 else "negative" if it_lots < 0 else ""
-
-                st.markdown(f"""
-                <div class="market-card">
-                    <h4>投信</h4>
-                    <p class="{it_color}" style="font-size: 1.5rem;">{it_lots:+,.0f} 張</p>
-                    <p>{'買超' if it_lots > 0 else '賣超' if it_lots < 0 else '持平'}</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            # 自營商買賣超
-            with col3:
-                dealer_lots = institutional_stats.get('dealer_net_lots', 0)
-                dealer_color = "positive" if dealer_lots > 0 else "negative" if dealer_lots < 0 else ""
-
-                st.markdown(f"""
-                <div class="market-card">
-                    <h4>自營商</h4>
-                    <p class="{dealer_color}" style="font-size: 1.5rem;">{dealer_lots:+,.0f} 張</p>
-                    <p>{'買超' if dealer_lots > 0 else '賣超' if dealer_lots < 0 else '持平'}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            # 三張卡片組成一段 HTML 一次送出
+            cards = []
+            for key, title in INSTITUTIONAL_CARDS:
+                lots = institutional_stats.get(f'{key}_lots', 0)
+                color, label = ("positive", "買超") if lots > 0 else ("negative", "賣超") if lots < 0 else ("", "持平")
+                cards.append(INSTITUTIONAL_CARD_TPL.format(title=title, color=color, lots=lots, label=label))
+            st.markdown(INSTITUTIONAL_GRID_TPL.format(cards="".join(cards)), unsafe_allow_html=True)
         else:
             st.warning("⚠️ 無法載入三大法人買賣超數據")
 
@@ -650,7 +755,7 @@ with tabs[1]:
 
 # ========== Tab 3: 經濟日曆 ==========
 
-with tabs[2]:
+elif active_tab == TAB_LABELS[2]:
     st.header("📅 經濟日曆時間軸")
 
     # 載入數據
@@ -670,11 +775,12 @@ with tabs[2]:
         if not events_by_date:
             st.info("未來兩週暫無重要經濟事件")
         else:
-            from backend.data_sources.trading_economics_client import TradingEconomicsClient
-
             # 計算總事件數（過濾前）
-            original_days = len(events_by_date)
-            original_events = sum(len(events) for events in events_by_date.values())
+            original_days = calendar_data.get('total_days', len(events_by_date))
+            original_events = calendar_data.get('total_events')
+            if original_events is None:
+                # 舊版磁碟快取沒有 total_events
+                original_events = sum(len(events) for events in events_by_date.values())
 
             # 過濾器選項
             col_filter1, col_filter2, col_filter3 = st.columns([2, 2, 3])
@@ -694,86 +800,17 @@ with tabs[2]:
                 # 先顯示原始統計，稍後會更新為過濾後的統計
                 stats_placeholder = st.empty()
 
-            # 準備表格數據
-            table_data = []
-            today = datetime.now().strftime('%Y-%m-%d')
-            now = datetime.now()
-
             importance_map = {"⭐⭐⭐ 高": 3, "⭐⭐ 中": 2, "⭐ 低": 1}
-            allowed_levels = {importance_map[f] for f in importance_filter}
-
-            for date_str, events in events_by_date.items():
-                for event in events:
-                    importance_level = event.get('importance_level', 1)
-
-                    # 應用重要性篩選
-                    if importance_level not in allowed_levels:
-                        continue
-
-                    # 判斷是否已過
-                    try:
-                        event_datetime_str = f"{date_str} {event.get('時間', '00:00')}"
-                        event_datetime = datetime.strptime(event_datetime_str, '%Y-%m-%d %H:%M')
-                        is_past = event_datetime < now
-                    except:
-                        is_past = False
-
-                    # 應用已過事件篩選
-                    if is_past and not show_past:
-                        continue
-
-                    # 格式化日期顯示
-                    try:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        weekday = date_obj.strftime('%a')
-                        if date_str == today:
-                            date_display = f"📅 今天 ({weekday})"
-                        else:
-                            date_display = f"{date_str} ({weekday})"
-                    except:
-                        date_display = date_str
-
-                    # 生成新聞連結（優先使用 Investing.com 事件連結）
-                    links_display = ""
-                    event_url = event.get('event_url', '')
-
-                    if event_url:
-                        # 如果有 Investing.com 事件連結，優先使用
-                        links_display = f"[🔍詳情]({event_url})"
-                    else:
-                        # 回退到 Google 新聞搜尋
-                        news_links = TradingEconomicsClient.generate_news_links(event)
-                        if news_links:
-                            link_parts = []
-                            for source, url in news_links.items():
-                                if source == 'google_news':
-                                    link_parts.append(f"[🔍GN]({url})")
-                                elif source == 'cnyes':
-                                    link_parts.append(f"[📰鉅亨]({url})")
-                                elif source == 'ctee':
-                                    link_parts.append(f"[📰工商]({url})")
-                            links_display = " ".join(link_parts)
-
-                    table_data.append({
-                        "日期": date_display,
-                        "時間": event.get('時間', '-'),
-                        "事件": event.get('事件', 'N/A'),
-                        "⭐": event.get('重要性', '⭐'),
-                        "預期": event.get('預期', '-'),
-                        "前值": event.get('前值', '-'),
-                        "實際": event.get('實際', '-'),
-                        "新聞": links_display,
-                        "_importance": importance_level,  # 隱藏欄位用於排序
-                        "_is_past": is_past  # 隱藏欄位用於樣式
-                    })
-
-            # 計算過濾後的統計數據
-            if table_data:
-                filtered_days = len(set(row["日期"] for row in table_data))
-                filtered_events = len(table_data)
-            else:
-                filtered_days = 0
-                filtered_events = 0
+            # 重要性篩選轉為位元遮罩（第 1~3 位元對應低/中/高）
+            allowed_mask = 0
+            for label in importance_filter:
+                allowed_mask |= 1 << importance_map[label]
+
+            # 事件行 HTML 依數據版本 / 篩選 / 日期快取；已過事件篩選每次以當下時間處理
+            calendar_rows = build_calendar_rows(
+                calendar_data.get('updated_at'), events_by_date, allowed_mask, update_time.strftime('%Y-%m-%d')
+            )
+            timeline_html, filtered_days, filtered_events = render_calendar_html(calendar_rows, show_past, update_time)
 
             # 更新統計顯示
             with stats_placeholder:
@@ -784,77 +821,12 @@ with tabs[2]:
                     # 無過濾時，只顯示總數
                     st.info(f"📊 共 {original_days} 天 {original_events} 個事件")
 
-            if not table_data:
+            if not filtered_events:
                 st.warning("⚠️ 沒有符合篩選條件的事件，請調整篩選器")
             else:
                 # 顯示表格
                 st.markdown("### 📊 經濟事件總覽")
-
-                # 按日期和時間排序
-                table_data_sorted = sorted(table_data, key=lambda x: (x["日期"], x["時間"]))
-
-                # 分組顯示（按日期）
-                current_date = None
-                for row in table_data_sorted:
-                    row_date = row["日期"]
-
-                    # 日期標題（sticky header風格）
-                    if row_date != current_date:
-                        current_date = row_date
-                        is_today_row = "今天" in row_date
-
-                        if is_today_row:
-                            st.markdown(f'<div class="economic-calendar-today"><h4 style="margin: 0;">🌟 {row_date}</h4></div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown(f'<div class="economic-calendar-date"><h4 style="margin: 0;">📅 {row_date}</h4></div>', unsafe_allow_html=True)
-
-                    # 事件行（根據重要性使用不同樣式）
-                    importance = row["_importance"]
-                    is_past = row["_is_past"]
-
-                    # 根據重要性選擇 CSS class
-                    if importance >= 3:
-                        css_class = "event-high-importance"
-                    elif importance == 2:
-                        css_class = "event-medium-importance"
-                    else:
-                        css_class = "event-low-importance"
-
-                    # 建立事件行
-                    with st.container():
-                        st.markdown(f'<div class="{css_class}">', unsafe_allow_html=True)
-
-                        col1, col2, col3, col4, col5, col6 = st.columns([1, 5, 1, 1.5, 1.5, 2])
-
-                        with col1:
-                            st.caption(row["時間"])
-
-                        with col2:
-                            # 根據重要性顯示不同顏色和樣式
-                            event_name = row["事件"]
-                            if importance >= 3:
-                                st.markdown(f"**{event_name}** 🔴")
-                            elif importance == 2:
-                                st.write(event_name)
-                            else:
-                                st.markdown(f"<span style='opacity: 0.7'>{event_name}</span>", unsafe_allow_html=True)
-
-                        with col3:
-                            st.caption(row["⭐"])
-
-                        with col4:
-                            forecast_val = row['預期']
-                            st.caption(f"預: {forecast_val}")
-
-                        with col5:
-                            previous_val = row['前值']
-                            st.caption(f"前: {previous_val}")
-
-                        with col6:
-                            if row["新聞"]:
-                                st.markdown(row["新聞"], unsafe_allow_html=False)
-
-                        st.markdown('</div>', unsafe_allow_html=True)
+                st.markdown(timeline_html, unsafe_allow_html=True)
 
         st.markdown("---")
 
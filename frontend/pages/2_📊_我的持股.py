@@ -5,60 +5,14 @@
 
 import streamlit as st
 import pandas as pd
-import sys
-from pathlib import Path
 from datetime import datetime
+from pathlib import Path
 
-# 添加專案根目錄到路徑
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
+# 專案根目錄已由 frontend/app.py（st.navigation 路由）加入 sys.path
 from backend.database.duckdb_client import DuckDBClient
 from backend.data_sources.finlab_client import FinLabClient
 from backend.indicators.technical_indicators import get_stock_indicators
-from config.settings import settings
-from frontend.theme import Theme
-
-# ========== 頁面配置 ==========
-
-st.set_page_config(
-    page_title="我的持股 - KevinRule",
-    page_icon="📊",
-    layout="wide"
-)
-
-# ========== 主題初始化 ==========
-if 'theme' not in st.session_state:
-    st.session_state.theme = 'dark'  # 預設深色主題
-
-# ========== 應用主題 CSS ==========
-st.markdown(Theme.generate_css(st.session_state.theme), unsafe_allow_html=True)
-
-# ========== 側邊欄導航樣式優化 ==========
-st.markdown("""
-<style>
-/* 優化側邊欄導航樣式 */
-[data-testid="stSidebarNav"] {
-    padding-top: 1rem;
-}
-
-/* 優化導航連結樣式 */
-[data-testid="stSidebarNav"] ul {
-    padding: 0;
-}
-
-[data-testid="stSidebarNav"] a {
-    padding: 0.75rem 1rem;
-    border-radius: 0.5rem;
-    margin-bottom: 0.25rem;
-    transition: background-color 0.2s;
-}
-
-[data-testid="stSidebarNav"] a:hover {
-    background-color: rgba(128, 128, 128, 0.1);
-}
-</style>
-""", unsafe_allow_html=True)
+from config.settings import get_settings
 
 # ========== 頁面標題 ==========
 
@@ -68,47 +22,72 @@ st.markdown("---")
 
 # ========== 載入持股數據 ==========
 
-@st.cache_data(ttl=300)  # 快取5分鐘
-def load_watchlist():
-    """載入自選股列表"""
-    try:
-        with DuckDBClient() as db:
-            return db.get_watchlist()
-    except Exception as e:
-        st.error(f"載入持股失敗: {e}")
-        return pd.DataFrame()
+def _watchlist_db_version() -> tuple:
+    """
+    自選股資料庫的版本標記（主檔與 WAL 檔的修改時間）
 
+    任何頁面寫入 DuckDB 都會更新這兩個檔案之一，
+    以此作為快取鍵即可在資料變動時自動失效，不需依賴 TTL 重新查詢。
 
-@st.cache_data(ttl=300)  # 快取5分鐘
-def load_stock_analysis(stock_id: str):
+    Returns:
+        (主檔 mtime_ns, WAL 檔 mtime_ns)，檔案不存在時為 0
+    """
+    db_path = Path(get_settings().duckdb_path)
+    wal_path = db_path.with_name(db_path.name + '.wal')
+    return tuple(
+        path.stat().st_mtime_ns if path.exists() else 0
+        for path in (db_path, wal_path)
+    )
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_watchlist(db_version: tuple):
     """
-    載入個股的完整分析數據
+    載入自選股列表
 
     Args:
-        stock_id: 股票代碼
+        db_version: 資料庫版本標記（僅作為快取鍵，見 _watchlist_db_version）
 
     Returns:
-        包含價格、技術指標、基本面的字典
+        自選股 DataFrame
+
+    Raises:
+        讀取失敗時直接拋出（例外不會被快取），由呼叫端顯示錯誤
     """
-    try:
-        client = FinLabClient()
+    with DuckDBClient() as db:
+        return db.get_watchlist()
 
-        # 獲取價格數據
-        close_df = client.get_close()
 
-        if stock_id not in close_df.columns:
-            return None
+@st.cache_resource
+def get_finlab_client() -> FinLabClient:
+    """FinLab 客戶端（程序內共用，登入只做一次）"""
+    return FinLabClient()
 
-        stock_prices = close_df[stock_id].dropna()
 
-        if len(stock_prices) < 60:  # 需要至少60天數據
-            return None
+def _latest_value(latest_row: pd.Series, stock_id: str, scale: float = 1.0):
+    """取得個股在最新一期數據列中的數值（無此股票時回傳 None）"""
+    value = latest_row.get(stock_id)
+    return None if value is None else float(value * scale)
 
-        # 獲取最新價格
-        current_price = float(stock_prices.iloc[-1])
 
-        # 計算技術指標
-        indicators = get_stock_indicators(stock_id, stock_prices)
+@st.cache_data(ttl=300)  # 快取5分鐘
+def load_all_stock_analysis(stock_ids: tuple) -> dict:
+    """
+    批次載入所有持股的完整分析數據（每個 FinLab 數據表只下載一次）
+
+    Args:
+        stock_ids: 股票代碼（tuple 以作為快取鍵）
+
+    Returns:
+        {股票代碼: 包含價格、技術指標、基本面的字典}，數據不足的股票為 None
+    """
+    results = {stock_id: None for stock_id in stock_ids}
+
+    try:
+        client = get_finlab_client()
+
+        # 獲取價格數據
+        close_df = client.get_close()
 
         # 獲取基本面數據
         pe_df = client.get_pe_ratio()
@@ -122,38 +101,80 @@ def load_stock_analysis(stock_id: str):
         # 獲取成交量
         volume_df = client.get_volume()
 
-        # 組合所有數據
-        analysis = {
-            # 當前價格
-            'current_price': current_price,
+    except Exception as e:
+        print(f"❌ 載入持股分析數據失敗: {e}")
+        return results
+
+    # 每個數據表只取一次最新一列（以股票代碼為 index），所有持股共用
+    empty_row = pd.Series(dtype=float)
+    latest = {
+        key: df.iloc[-1] if not df.empty else empty_row
+        for key, df in (
+            ('pe', pe_df),
+            ('pb', pb_df),
+            ('dividend_yield', dividend_yield_df),
+            ('roe', roe_df),
+            ('margin_balance', margin_data['margin_balance']),
+            ('short_balance', margin_data['short_balance']),
+            ('volume', volume_df),
+        )
+    }
 
-            # 技術指標
-            'ma_5': indicators.get('ma_5'),
-            'ma_20': indicators.get('ma_20'),
-            'ma_60': indicators.get('ma_60'),
-            'rsi': indicators.get('rsi'),
-            'macd_trend': indicators.get('trend'),
+    for stock_id in stock_ids:
+        try:
+            if stock_id not in close_df.columns:
+                continue
 
-            # 基本面
-            'pe': float(pe_df[stock_id].iloc[-1]) if stock_id in pe_df.columns and not pe_df.empty else None,
-            'pb': float(pb_df[stock_id].iloc[-1]) if stock_id in pb_df.columns and not pb_df.empty else None,
-            'dividend_yield': float(dividend_yield_df[stock_id].iloc[-1] * 100) if stock_id in dividend_yield_df.columns and not dividend_yield_df.empty else None,
-            'roe': float(roe_df[stock_id].iloc[-1] * 100) if stock_id in roe_df.columns and not roe_df.empty else None,
+            stock_prices = close_df[stock_id].dropna()
 
-            # 籌碼面
-            'margin_balance': float(margin_data['margin_balance'][stock_id].iloc[-1]) if stock_id in margin_data['margin_balance'].columns else None,
-            'short_balance': float(margin_data['short_balance'][stock_id].iloc[-1]) if stock_id in margin_data['short_balance'].columns else None,
-            'volume': float(volume_df[stock_id].iloc[-1]) if stock_id in volume_df.columns else None,
-        }
+            if len(stock_prices) < 60:  # 需要至少60天數據
+                continue
 
-        return analysis
+            # 計算技術指標
+            indicators = get_stock_indicators(stock_id, stock_prices)
 
-    except Exception as e:
-        print(f"❌ 載入 {stock_id} 分析數據失敗: {e}")
-        return None
+            # 組合所有數據
+            results[stock_id] = {
+                # 當前價格
+                'current_price': float(stock_prices.iloc[-1]),
 
+                # 技術指標
+                'ma_5': indicators.get('ma_5'),
+                'ma_20': indicators.get('ma_20'),
+                'ma_60': indicators.get('ma_60'),
+                'rsi': indicators.get('rsi'),
+                'macd_trend': indicators.get('trend'),
 
-watchlist = load_watchlist()
+                # 基本面
+                'pe': _latest_value(latest['pe'], stock_id),
+                'pb': _latest_value(latest['pb'], stock_id),
+                'dividend_yield': _latest_value(latest['dividend_yield'], stock_id, 100),
+                'roe': _latest_value(latest['roe'], stock_id, 100),
+
+                # 籌碼面
+                'margin_balance': _latest_value(latest['margin_balance'], stock_id),
+                'short_balance': _latest_value(latest['short_balance'], stock_id),
+                'volume': _latest_value(latest['volume'], stock_id),
+            }
+
+        except Exception as e:
+            print(f"❌ 載入 {stock_id} 分析數據失敗: {e}")
+
+    return results
+
+
+# 指標卡片樣板
+METRIC_ITEM_TPL = (
+    '<div class="metric-item"><strong>{label}</strong><br>'
+    '<span style="font-size: 1.2rem;{style}">{value}</span></div>'
+)
+
+try:
+    watchlist = load_watchlist(_watchlist_db_version())
+except Exception as e:
+    # 暫時性失敗（例如其他程序鎖住資料庫檔案）不寫入快取，下次 rerun 會重試
+    st.error(f"載入持股失敗: {e}")
+    watchlist = pd.DataFrame()
 
 # ========== 側邊欄 - 新增/刪除股票 ==========
 
@@ -202,7 +223,6 @@ with st.sidebar:
                                 notes=new_notes
                             )
                         st.success(f"✅ 已加入 {new_stock_id} ({new_stock_name})")
-                        st.cache_data.clear()
                         st.rerun()
                     except Exception as e:
                         st.error(f"❌ 加入失敗: {str(e)}")
@@ -226,7 +246,6 @@ with st.sidebar:
                 with DuckDBClient() as db:
                     db.remove_from_watchlist(delete_stock)
                 st.success(f"✅ 已刪除 {delete_stock}")
-                st.cache_data.clear()
                 st.rerun()
             except Exception as e:
                 st.error(f"❌ 刪除失敗: {str(e)}")
@@ -235,7 +254,8 @@ with st.sidebar:
 
     # 刷新按鈕
     if st.button("🔄 刷新數據", width='stretch'):
-        st.cache_data.clear()
+        load_watchlist.clear()
+        load_all_stock_analysis.clear()
         st.rerun()
 
 # ========== 主要內容 ==========
@@ -259,11 +279,8 @@ else:
     # 顯示持股列表
     st.subheader(f"💼 當前持股 ({len(watchlist)} / 5 檔)")
 
-    # 總覽統計
-    total_buy_value = 0
-    for _, row in watchlist.iterrows():
-        if pd.notna(row['buy_price']) and pd.notna(row['shares']):
-            total_buy_value += row['buy_price'] * row['shares']
+    # 總覽統計（未設定價格或股數的持股為 NaN，sum 時自動略過）
+    total_buy_value = float((watchlist['buy_price'] * watchlist['shares']).sum())
 
     col1, col2, col3 = st.columns(3)
 
@@ -278,6 +295,10 @@ else:
 
     st.markdown("---")
 
+    # 所有持股的分析數據一次載入（每個 FinLab 數據表只下載一次）
+    with st.spinner("正在載入持股分析數據..."):
+        all_analysis = load_all_stock_analysis(tuple(watchlist['stock_id']))
+
     # 遍歷每一檔股票，顯示詳細資訊
     for idx, stock in watchlist.iterrows():
         stock_id = stock['stock_id']
@@ -303,126 +324,54 @@ else:
             with tab1:
                 st.markdown("### 📊 15 項關鍵分析維度")
 
-                # 載入分析數據
-                with st.spinner(f"正在載入 {stock_id} 的分析數據..."):
-                    analysis = load_stock_analysis(stock_id)
+                analysis = all_analysis.get(stock_id)
 
                 if analysis is None:
                     st.warning(f"⚠️ 無法載入 {stock_id} 的分析數據（可能是數據不足或股票代碼錯誤）")
                 else:
-                    # 分類展示
-                    col1, col2, col3 = st.columns(3)
-
-                    with col1:
-                        st.markdown("#### 📈 價值評估")
-
-                        # 本益比
-                        pe = analysis.get('pe')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>本益比 (PE)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{pe:.2f}' if pe else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        # 股價淨值比
-                        pb = analysis.get('pb')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>股價淨值比 (PB)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{pb:.2f}' if pb else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        # 殖利率
-                        div_yield = analysis.get('dividend_yield')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>殖利率 (%)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{div_yield:.2f}%' if div_yield else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        # ROE
-                        roe = analysis.get('roe')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>ROE (%)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{roe:.2f}%' if roe else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                    with col2:
-                        st.markdown("#### 📊 技術指標")
-
-                        # 均線
-                        ma5 = analysis.get('ma_5')
-                        ma20 = analysis.get('ma_20')
-                        ma60 = analysis.get('ma_60')
-
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>5日均線</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{ma5:.2f}' if ma5 else 'N/A'}</span>
-                        </div>
-                        <div class="metric-item">
-                            <strong>20日均線</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{ma20:.2f}' if ma20 else 'N/A'}</span>
-                        </div>
-                        <div class="metric-item">
-                            <strong>60日均線</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{ma60:.2f}' if ma60 else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        # RSI
-                        rsi = analysis.get('rsi')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>RSI (14日)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{rsi:.2f}' if rsi else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        # MACD
-                        macd_trend = analysis.get('macd_trend')
-                        trend_color = '#28a745' if macd_trend == '多頭' else '#dc3545' if macd_trend == '空頭' else '#6c757d'
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>MACD 訊號</strong><br>
-                            <span style="font-size: 1.2rem; color: {trend_color};">{macd_trend or 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                    with col3:
-                        st.markdown("#### 💵 籌碼面")
-
-                        # 融資餘額
-                        margin_balance = analysis.get('margin_balance')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>融資餘額 (張)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{int(margin_balance):,}' if margin_balance else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        # 融券餘額
-                        short_balance = analysis.get('short_balance')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>融券餘額 (張)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{int(short_balance):,}' if short_balance else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        # 成交量
-                        volume = analysis.get('volume')
-                        st.markdown(f"""
-                        <div class="metric-item">
-                            <strong>成交量 (張)</strong><br>
-                            <span style="font-size: 1.2rem;">{f'{int(volume/1000):,}' if volume else 'N/A'}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    pe = analysis.get('pe')
+                    pb = analysis.get('pb')
+                    div_yield = analysis.get('dividend_yield')
+                    roe = analysis.get('roe')
+                    ma5 = analysis.get('ma_5')
+                    ma20 = analysis.get('ma_20')
+                    ma60 = analysis.get('ma_60')
+                    rsi = analysis.get('rsi')
+                    macd_trend = analysis.get('macd_trend')
+                    trend_color = '#28a745' if macd_trend == '多頭' else '#dc3545' if macd_trend == '空頭' else '#6c757d'
+                    margin_balance = analysis.get('margin_balance')
+                    short_balance = analysis.get('short_balance')
+                    volume = analysis.get('volume')
+
+                    # 分類展示（每欄的指標卡片組成一段 HTML 一次送出）
+                    metric_columns = (
+                        ("#### 📈 價值評估", (
+                            ("本益比 (PE)", f'{pe:.2f}' if pe else 'N/A', ""),
+                            ("股價淨值比 (PB)", f'{pb:.2f}' if pb else 'N/A', ""),
+                            ("殖利率 (%)", f'{div_yield:.2f}%' if div_yield else 'N/A', ""),
+                            ("ROE (%)", f'{roe:.2f}%' if roe else 'N/A', ""),
+                        )),
+                        ("#### 📊 技術指標", (
+                            ("5日均線", f'{ma5:.2f}' if ma5 else 'N/A', ""),
+                            ("20日均線", f'{ma20:.2f}' if ma20 else 'N/A', ""),
+                            ("60日均線", f'{ma60:.2f}' if ma60 else 'N/A', ""),
+                            ("RSI (14日)", f'{rsi:.2f}' if rsi else 'N/A', ""),
+                            ("MACD 訊號", macd_trend or 'N/A', f" color: {trend_color};"),
+                        )),
+                        ("#### 💵 籌碼面", (
+                            ("融資餘額 (張)", f'{int(margin_balance):,}' if margin_balance else 'N/A', ""),
+                            ("融券餘額 (張)", f'{int(short_balance):,}' if short_balance else 'N/A', ""),
+                            ("成交量 (張)", f'{int(volume/1000):,}' if volume else 'N/A', ""),
+                        )),
+                    )
+
+                    for col, (heading, items) in zip(st.columns(3), metric_columns):
+                        with col:
+                            st.markdown(heading)
+                            st.markdown("".join(
+                                METRIC_ITEM_TPL.format(label=label, value=value, style=style)
+                                for label, value, style in items
+                            ), unsafe_allow_html=True)
 
                     st.markdown("---")
                     st.markdown("✅ **數據來源**: FinLab API 即時數據")
@@ -433,8 +382,7 @@ else:
 
                 if buy_price and shares:
                     # 獲取當前真實價格
-                    with st.spinner(f"正在獲取 {stock_id} 最新價格..."):
-                        analysis = load_stock_analysis(stock_id)
+                    analysis = all_analysis.get(stock_id)
 
                     if analysis and analysis.get('current_price'):
                         current_price = analysis['current_price']
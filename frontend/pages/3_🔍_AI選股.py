@@ -5,84 +5,71 @@ AI選股頁面
 
 import streamlit as st
 import pandas as pd
-import sys
-from pathlib import Path
 import traceback
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# 添加專案根目錄到路徑
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
+# 專案根目錄已由 frontend/app.py（st.navigation 路由）加入 sys.path
 from backend.data_sources.finlab_client import FinLabClient
 from backend.strategies.strategy_manager import StrategyManager
 from backend.strategies.original.strategy_manager_original import StrategyManagerOriginal
 from backend.database.duckdb_client import DuckDBClient
-from config.settings import settings
-from frontend.theme import Theme
-
-# ========== 頁面配置 ==========
-
-st.set_page_config(
-    page_title="AI選股 - KevinRule",
-    page_icon="🔍",
-    layout="wide"
-)
-
-# ========== 主題初始化 ==========
-if 'theme' not in st.session_state:
-    st.session_state.theme = 'dark'  # 預設深色主題
-
-# ========== 應用主題 CSS ==========
-st.markdown(Theme.generate_css(st.session_state.theme), unsafe_allow_html=True)
 
 # ========== 數據加載函數（使用 Streamlit Cache）==========
 
-@st.cache_data(ttl=86400, show_spinner=False)  # 1天緩存，FinLab 數據日更
-def load_strategy_data(data_keys: tuple, progress_callback=None) -> dict:
+@st.cache_resource(ttl=86400, show_spinner=False)  # 1天緩存，FinLab 數據日更
+def load_strategy_data(data_keys: tuple, _progress_callback=None) -> dict:
     """
     按需加載策略所需數據（使用 Streamlit 緩存）
 
+    使用 st.cache_resource：FinLab 寬表動輒數十 MB，st.cache_data 每次命中都要反序列化一份複本；
+    cache_resource 直接共用同一物件。共用衍生數據（revenue_yoy 等）在此建立時一併算好，
+    快取中的字典建立後即為唯讀，所有 session 與策略執行緒只讀取不寫入。
+
     Args:
         data_keys: 需要載入的數據鍵集合（tuple 可 hashable）
-        progress_callback: 進度回調函數
+        _progress_callback: 進度回調函數（底線開頭，不參與快取鍵雜湊）
 
     Returns:
         包含請求數據的字典
     """
-    client = FinLabClient(progress_callback=progress_callback)
-    return client.get_data_bundle(set(data_keys))
+    client = FinLabClient(progress_callback=_progress_callback)
+    data = client.get_data_bundle(set(data_keys))
+    StrategyManager.precompute(data)
+    return data
 
-# ========== 側邊欄導航樣式優化 ==========
-st.markdown("""
-<style>
-/* 優化側邊欄導航樣式 */
-[data-testid="stSidebarNav"] {
-    padding-top: 1rem;
-}
-
-/* 優化導航連結樣式 */
-[data-testid="stSidebarNav"] ul {
-    padding: 0;
-}
-
-[data-testid="stSidebarNav"] a {
-    padding: 0.75rem 1rem;
-    border-radius: 0.5rem;
-    margin-bottom: 0.25rem;
-    transition: background-color 0.2s;
-}
-
-[data-testid="stSidebarNav"] a:hover {
-    background-color: rgba(128, 128, 128, 0.1);
-}
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def get_strategy_meta(engine: str) -> dict:
+    """
+    取得策略靜態資訊（程序內共用，避免每次 rerun 逐一取策略物件）
+
+    Args:
+        engine: 策略引擎（"學術優化版" 或 "原始 Kevin 版"）
+
+    Returns:
+        {策略鍵: (策略名稱, 策略說明)}
+    """
+    if engine == "學術優化版":
+        return {s['key']: (s['name'], s['description']) for s in StrategyManager().list_strategies()}
+    return {s['id']: (s['name'], s['description']) for s in StrategyManagerOriginal().get_strategy_list()}
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def df_to_csv(df: pd.DataFrame) -> bytes:
+    """
+    將結果轉為 CSV 位元組（依內容快取，結果不變時 rerun 不重新編碼）
+
+    Args:
+        df: 要下載的結果 DataFrame
+
+    Returns:
+        帶 BOM 的 UTF-8 CSV（Excel 可正確顯示中文）
+    """
+    return df.to_csv(index=False).encode('utf-8-sig')
 
 # ========== 初始化 Session State ==========
 
 # 注意：不再使用 session_state 存儲大數據
-# 數據通過 @st.cache_data 管理，自動緩存和清理
+# 數據通過 @st.cache_resource 管理，跨 session 共用並依 TTL 自動清理
 
 if 'results' not in st.session_state:
     st.session_state.results = None
@@ -226,20 +213,14 @@ with st.sidebar:
 
     # 清除快取（清除 Streamlit cache 和結果）
     if st.button("🔄 重新載入數據", width='stretch'):
-        st.cache_data.clear()
+        load_strategy_data.clear()
         st.session_state.results = None
         st.success("✅ 緩存已清除")
         st.rerun()
 
 # ========== 主要內容 ==========
 
-# 檢查配置
-is_valid, errors = settings.validate()
-if not is_valid:
-    st.error("❌ 系統配置不完整，請先完成設定！")
-    for error in errors:
-        st.warning(error)
-    st.stop()
+# 配置檢查已由 frontend/app.py 路由統一處理（配置不完整時不會執行任何頁面）
 
 # 執行選股
 if run_button:
@@ -314,40 +295,54 @@ if run_button:
         strategy_progress = 0
         strategy_count = len(selected_strategies)
 
-        for i, strategy_key in enumerate(selected_strategies):
-            # 獲取策略名稱（兩個管理器接口略有不同）
-            if hasattr(manager, 'get_strategy'):
-                strategy_name = manager.get_strategy(strategy_key).name
-            else:
-                # StrategyManagerOriginal 使用 strategies 字典
-                strategy_name = manager.strategies[strategy_key].strategy_name
+        # 獲取策略名稱（兩個管理器的靜態資訊已統一為 {鍵: (名稱, 說明)}）
+        strategy_meta = get_strategy_meta(st.session_state.strategy_engine)
+        strategy_names = {key: strategy_meta[key][0] for key in selected_strategies}
 
-            status_text.text(f"🔄 執行策略 {i+1}/{strategy_count}: {strategy_name}")
+        status_text.text(f"🔄 並行執行 {strategy_count} 個策略...")
 
-            try:
-                result = manager.run_strategy(strategy_key, data)
-                # 使用 copy() 避免引用問題：防止 upsert 修改原 DataFrame
-                results[strategy_key] = result.copy() if not result.empty else result
-
-                # 保存到資料庫
-                if save_to_db and not result.empty:
-                    with DuckDBClient() as db:
-                        db.upsert_strategy_selection(
-                            strategy_name=strategy_key,
-                            selection_date=datetime.now().date(),
-                            selections=result
-                        )
+        # 各策略只讀取共用的 data（衍生數據已於 load_strategy_data 建立時算好），
+        # pandas/NumPy 運算大多釋放 GIL，並行執行；
+        # UI 更新只在主執行緒（as_completed 迴圈）中進行
+        with ThreadPoolExecutor(max_workers=max(strategy_count, 1), thread_name_prefix="strategy") as pool:
+            futures = {
+                pool.submit(manager.run_strategy, strategy_key, data): strategy_key
+                for strategy_key in selected_strategies
+            }
 
-            except Exception as e:
-                st.error(f"策略 {strategy_key} 執行失敗: {str(e)}")
-                results[strategy_key] = pd.DataFrame()
+            for i, future in enumerate(as_completed(futures)):
+                strategy_key = futures[future]
+
+                try:
+                    result = future.result()
+                    # 使用 copy() 避免引用問題：防止 upsert 修改原 DataFrame
+                    results[strategy_key] = result.copy() if not result.empty else result
+
+                except Exception as e:
+                    st.error(f"策略 {strategy_key} 執行失敗: {str(e)}")
+                    results[strategy_key] = pd.DataFrame()
+
+                # 更新進度
+                status_text.text(f"✅ 已完成 {i+1}/{strategy_count}: {strategy_names[strategy_key]}")
+                strategy_progress = 40 + int((i + 1) / strategy_count * 50)
+                progress_bar.progress(strategy_progress)
 
-            # 更新進度
-            strategy_progress = 40 + int((i + 1) / strategy_count * 50)
-            progress_bar.progress(strategy_progress)
+        # 依選取順序排列結果
+        results = {strategy_key: results[strategy_key] for strategy_key in selected_strategies}
 
         st.session_state.results = results
 
+        # 保存到資料庫（所有策略結果一次寫入）
+        if save_to_db:
+            try:
+                with DuckDBClient() as db:
+                    db.upsert_strategy_selections(
+                        selection_date=datetime.now().date(),
+                        results=results
+                    )
+            except Exception as e:
+                st.error(f"儲存選股結果失敗: {str(e)}")
+
         # Step 3: 完成
         progress_bar.progress(100)
         status_text.text("✅ 所有策略執行完成！")
@@ -370,14 +365,22 @@ if st.session_state.results:
     else:
         manager = StrategyManagerOriginal()
 
+    strategy_meta = get_strategy_meta(st.session_state.strategy_engine)
+
     st.markdown("---")
     st.header("📊 選股結果")
 
     # 總覽統計
     col1, col2, col3, col4 = st.columns(4)
 
-    total_selections = sum(len(df) for df in results.values() if not df.empty)
-    strategies_with_results = sum(1 for df in results.values() if not df.empty)
+    # 單次走訪結果：同時累計推薦總數與有結果的策略數
+    total_selections = 0
+    strategies_with_results = 0
+    for df in results.values():
+        n = len(df)
+        if n:
+            total_selections += n
+            strategies_with_results += 1
 
     with col1:
         st.markdown(f"""
@@ -496,16 +499,7 @@ if st.session_state.results:
             if result_df.empty:
                 continue
 
-            # 獲取策略對象（兩個 manager 接口不同）
-            if hasattr(manager, 'get_strategy'):
-                strategy = manager.get_strategy(strategy_key)
-                strategy_name = strategy.name
-                strategy_description = strategy.description
-            else:
-                # StrategyManagerOriginal 使用 strategies 字典
-                strategy = manager.strategies[strategy_key]
-                strategy_name = strategy.strategy_name
-                strategy_description = strategy.description
+            strategy_name, strategy_description = strategy_meta[strategy_key]
 
             with st.expander(f"**{strategy_name}** - 選出 {len(result_df)} 檔股票", expanded=False):
                 st.markdown(f"_{strategy_description}_")
@@ -525,10 +519,9 @@ if st.session_state.results:
                 )
 
                 # 下載按鈕
-                csv = result_df.to_csv(index=False, encoding='utf-8-sig')
                 st.download_button(
                     label="📥 下載完整結果 (CSV)",
-                    data=csv,
+                    data=df_to_csv(result_df),
                     file_name=f"{strategy_key}_{datetime.now().strftime('%Y%m%d')}.csv",
                     mime="text/csv"
                 )
@@ -553,10 +546,9 @@ if st.session_state.results:
             )
 
             # 下載按鈕
-            csv = stock_appearances.to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
                 label="📥 下載綜合結果 (CSV)",
-                data=csv,
+                data=df_to_csv(stock_appearances),
                 file_name=f"all_strategies_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )